@@ -42,16 +42,74 @@ __repo__ = "https://github.com/adafruit/Adafruit_CircuitPython_Requests.git"
 import errno
 import json as json_module
 import os
+import random
 import sys
+import time
+from collections import OrderedDict
 
 from adafruit_connection_manager import get_connection_manager
 
+try:
+    import asyncio
+except ImportError:
+    asyncio = None
+
+try:
+    # Session.map and Session.as_completed need threads, which CircuitPython doesn't have.
+    import threading
+    from concurrent import futures
+except ImportError:
+    threading = None
+    futures = None
+
+try:
+    import zlib
+except ImportError:
+    zlib = None
+
+try:
+    # CircuitPython and MicroPython provide streaming decompression through deflate instead
+    import deflate
+except ImportError:
+    deflate = None
+
+try:
+    import io
+
+    # Unwrapped binary files, which read as they are on disk, so socket.sendfile can send them
+    # and os.stat gives their length.
+    _PLAIN_FILES = (io.FileIO, io.BufferedReader)
+except (ImportError, AttributeError):
+    _PLAIN_FILES = ()
+
 SEEK_END = 2
+# The size of the reads used to collect a body when its length isn't known ahead of time.
+CONTENT_CHUNK_SIZE = 1024
+# The size of the compressed reads made when decompressing content.
+DECOMPRESS_INPUT_SIZE = 512
+# The content encodings that can be decompressed, in the order they are advertised.
+DECOMPRESS_ENCODINGS = ("gzip", "deflate")
+# The largest slice of a bytes-like body, such as an mmap, handed to a single send.
+BODY_SLICE_SIZE = 1048576
 
 if not sys.implementation.name == "circuitpython":
     from types import TracebackType
-    from typing import IO, Any, Dict, Optional, Type
+    from typing import (
+        IO,
+        Any,
+        Callable,
+        Dict,
+        Iterable,
+        Iterator,
+        List,
+        Optional,
+        Sequence,
+        Tuple,
+        Type,
+        Union,
+    )
 
+    from circuitpython_typing import WriteableBuffer
     from circuitpython_typing.socket import (
         SocketpoolModuleType,
         SocketType,
@@ -70,7 +128,9 @@ class _RawResponse:
         """
         if size == -1:
             return self._response.content
-        return self._response.socket.recv(size)
+        buf = bytearray(size)
+        read = self._response._readinto(buf)
+        return bytes(memoryview(buf)[:read])
 
     def readinto(self, buf: bytearray) -> int:
         """Read as much as available into buf or until it is full. Returns the number of bytes read
@@ -78,10 +138,437 @@ class _RawResponse:
         return self._response._readinto(buf)
 
 
+class _BufferSocket:
+    """Replays a buffered response as if it was being received from a socket."""
+
+    def __init__(self, data: bytes) -> None:
+        self._data = memoryview(data)
+        self._position = 0
+
+    def recv(self, size: int) -> bytes:
+        """Receive up to size bytes."""
+        data = bytes(self._data[self._position : self._position + size])
+        self._position += len(data)
+        return data
+
+    def recv_into(self, buf: WriteableBuffer, size: int = 0) -> int:
+        """Receive up to size bytes, or as many as fit, into buf."""
+        size = min(size or len(buf), len(self._data) - self._position)
+        buf[:size] = self._data[self._position : self._position + size]
+        self._position += size
+        return size
+
+    def close(self) -> None:
+        """Release the buffered data."""
+        self._data = memoryview(b"")
+        self._position = 0
+
+
+class _PrefixedSocket:
+    """A socket with bytes that were already received from it put back in front."""
+
+    def __init__(self, prefix: bytes, sock: SocketType) -> None:
+        self._prefix = memoryview(prefix)
+        self.socket = sock
+
+    def recv_into(self, buf: WriteableBuffer, size: int = 0) -> int:
+        """Receive up to size bytes, or as many as fit, into buf."""
+        if not self._prefix:
+            return self.socket.recv_into(buf, size)
+        size = min(size or len(buf), len(self._prefix))
+        buf[:size] = self._prefix[:size]
+        self._prefix = self._prefix[size:]
+        return size
+
+
+class _BodyReader:
+    """Reads a response's content as it was sent, without decompressing it."""
+
+    def __init__(self, response: "Response") -> None:
+        self._response = response
+
+    def readinto(self, buf: WriteableBuffer) -> int:
+        """Read compressed content into buf."""
+        return self._response._read_body(buf)
+
+
+class _Decompressor:
+    """Decompresses gzip or deflate content as it is read from a response.
+
+    Compressed content is read ``DECOMPRESS_INPUT_SIZE`` bytes at a time and never more is
+    decompressed than fits in the caller's buffer, so memory use is bounded by the deflate
+    window (at most 32 KB) plus the input buffer no matter how large the content is.
+    """
+
+    def __init__(self, response: "Response", encoding: str) -> None:
+        self._response = response
+        self._encoding = encoding
+        self._stream = None
+        self._decompressor = None
+        self._input = None
+        self._tail = b""
+        self._output = b""
+        self._finished = False
+        if zlib is None or not hasattr(zlib, "decompressobj"):
+            self._stream = deflate.DeflateIO(
+                _BodyReader(response), deflate.GZIP if encoding == "gzip" else deflate.AUTO
+            )
+        else:
+            self._input = bytearray(DECOMPRESS_INPUT_SIZE)
+
+    @staticmethod
+    def supported() -> bool:
+        """Whether this platform can decompress content."""
+        return (zlib is not None and hasattr(zlib, "decompressobj")) or deflate is not None
+
+    def _wbits(self, start: bytes) -> int:
+        if self._encoding == "gzip":
+            # Expect a gzip header and trailer
+            return 16 + 15
+        # deflate should be zlib wrapped, but some servers send a raw deflate stream
+        if len(start) >= 2 and start[0] & 0x0F == 8 and ((start[0] << 8) | start[1]) % 31 == 0:
+            return 15
+        return -15
+
+    def readinto(self, buf: WriteableBuffer) -> int:
+        """Decompress content into buf, returning the number of bytes decompressed."""
+        if self._stream is not None:
+            return self._stream.readinto(buf)
+
+        while not self._output:
+            if self._tail:
+                self._output = self._decompressor.decompress(self._tail, len(buf))
+                self._tail = self._decompressor.unconsumed_tail
+                continue
+            if self._finished:
+                return 0
+            if self._decompressor is not None and self._decompressor.eof:
+                read = 0
+            else:
+                read = self._response._read_body(self._input)
+            if read == 0:
+                self._finished = True
+                if self._decompressor is not None:
+                    self._output = self._decompressor.flush()
+                continue
+            self._tail = memoryview(self._input)[:read]
+            if self._decompressor is None:
+                self._decompressor = zlib.decompressobj(self._wbits(self._tail))
+
+        size = min(len(buf), len(self._output))
+        buf[:size] = memoryview(self._output)[:size]
+        self._output = self._output[size:]
+        return size
+
+
+# Bytes that have a meaning in JSON outside of strings.
+_JSON_QUOTE = 0x22
+_JSON_BACKSLASH = 0x5C
+_JSON_COMMA = 0x2C
+_JSON_COLON = 0x3A
+_JSON_OPEN_OBJECT = 0x7B
+_JSON_CLOSE_OBJECT = 0x7D
+_JSON_OPEN_ARRAY = 0x5B
+_JSON_CLOSE_ARRAY = 0x5D
+_JSON_WHITESPACE = (0x20, 0x09, 0x0A, 0x0D)
+_JSON_DELIMITERS = (_JSON_COMMA, _JSON_CLOSE_OBJECT, _JSON_CLOSE_ARRAY) + _JSON_WHITESPACE
+
+
+class _JSONStream:
+    """Pulls JSON from a response through a small buffer.
+
+    Values that aren't selected are scanned and thrown away without being parsed, only the
+    selected value is collected and handed to the json module.
+    """
+
+    def __init__(self, response: "Response", buffer_size: int = 256) -> None:
+        self._response = response
+        self._buffer = bytearray(buffer_size)
+        self._position = 0
+        self._end = 0
+
+    def _fill(self) -> bool:
+        self._position = 0
+        self._end = self._response._readinto(self._buffer)
+        return self._end > 0
+
+    def _fill_or_fail(self) -> None:
+        if self._position == self._end and not self._fill():
+            raise ValueError("JSON content ended unexpectedly")
+
+    def _peek(self) -> int:
+        """Return the next byte that isn't whitespace, without consuming it."""
+        while True:
+            self._fill_or_fail()
+            char = self._buffer[self._position]
+            if char not in _JSON_WHITESPACE:
+                return char
+            self._position += 1
+
+    def _expect(self, expected: int) -> None:
+        char = self._peek()
+        if char != expected:
+            raise ValueError(f"Expected '{chr(expected)}' in JSON but found '{chr(char)}'")
+        self._position += 1
+
+    def _skip_string(self, capture: Optional[bytearray]) -> None:
+        """Consume the rest of a string whose opening quote was already consumed."""
+        buf = self._buffer
+        while True:
+            self._fill_or_fail()
+            start = self._position
+            quote = buf.find(b'"', start, self._end)
+            stop = self._end if quote < 0 else quote + 1
+            backslash = buf.find(b"\\", start, stop)
+            if backslash >= 0:
+                stop = backslash + 1
+            if capture is not None:
+                capture.extend(memoryview(buf)[start:stop])
+            self._position = stop
+            if backslash >= 0:
+                # Consume the escaped character too, it may be a quote.
+                self._fill_or_fail()
+                if capture is not None:
+                    capture.append(buf[self._position])
+                self._position += 1
+            elif quote >= 0:
+                return
+
+    def _skip_literal(self, capture: Optional[bytearray]) -> None:
+        """Consume the rest of a number, true, false or null."""
+        while self._position < self._end or self._fill():
+            char = self._buffer[self._position]
+            if char in _JSON_DELIMITERS:
+                return
+            if capture is not None:
+                capture.append(char)
+            self._position += 1
+
+    def skip(self, capture: Optional[bytearray] = None) -> None:
+        """Consume the next value, adding its bytes to ``capture`` if given."""
+        depth = 0
+        while True:
+            char = self._peek()
+            self._position += 1
+            if capture is not None:
+                capture.append(char)
+            if char == _JSON_QUOTE:
+                self._skip_string(capture)
+            elif char in (_JSON_OPEN_OBJECT, _JSON_OPEN_ARRAY):
+                depth += 1
+            elif char in (_JSON_CLOSE_OBJECT, _JSON_CLOSE_ARRAY):
+                depth -= 1
+            elif char not in (_JSON_COMMA, _JSON_COLON):
+                self._skip_literal(capture)
+            if depth == 0:
+                return
+
+    def value(self) -> Any:
+        """Parse the next value."""
+        capture = bytearray()
+        self.skip(capture)
+        return json_module.loads(str(capture, "utf-8"))
+
+    def _find_key(self, key: str) -> None:
+        self._expect(_JSON_OPEN_OBJECT)
+        while self._peek() != _JSON_CLOSE_OBJECT:
+            if self._peek() != _JSON_QUOTE:
+                raise ValueError("Expected a string key in JSON object")
+            if self.value() == key:
+                self._expect(_JSON_COLON)
+                return
+            self._expect(_JSON_COLON)
+            self.skip()
+            if self._peek() == _JSON_COMMA:
+                self._position += 1
+        raise KeyError(key)
+
+    def _find_index(self, index: int) -> None:
+        self._expect(_JSON_OPEN_ARRAY)
+        i = 0
+        while self._peek() != _JSON_CLOSE_ARRAY:
+            if i == index:
+                return
+            self.skip()
+            if self._peek() == _JSON_COMMA:
+                self._position += 1
+            i += 1
+        raise IndexError(index)
+
+    def select(self, path: Sequence[Union[str, int]]) -> Any:
+        """Parse only the value found by following ``path`` from the top of the document."""
+        for key in path:
+            if isinstance(key, int):
+                self._find_index(key)
+            else:
+                self._find_key(key)
+        return self.value()
+
+
+class _RequestWriter:
+    """Writes the pieces of a request to a socket.
+
+    Without a buffer every piece is sent as soon as it is written. With a buffer, pieces are
+    collected and only sent once the buffer is full or `flush` is called, so that the request
+    line, headers and small bodies go out in a single send.
+    """
+
+    def __init__(self, socket: SocketType, buffer: Optional[bytearray] = None) -> None:
+        self.socket = socket
+        self._buffer = buffer
+        self._end = 0
+        self.written = 0
+
+    def write(self, data: bytes) -> None:
+        """Queue data to be sent, sending it right away if the writer is unbuffered."""
+        self.written += len(data)
+        buf = self._buffer
+        if buf is None:
+            Session._send(self.socket, data)
+            return
+        size = len(data)
+        if self._end + size > len(buf):
+            self.flush()
+            if size > len(buf):
+                Session._send(self.socket, data)
+                return
+        buf[self._end : self._end + size] = data
+        self._end += size
+
+    def flush(self) -> None:
+        """Send everything that has been queued so far."""
+        if self._end:
+            end = self._end
+            self._end = 0
+            Session._send(self.socket, memoryview(self._buffer)[:end])
+
+
+class _NoLock:
+    """Stands in for a lock when there are no threads."""
+
+    def __enter__(self) -> None:
+        pass
+
+    def __exit__(self, *exc_info: Any) -> None:
+        pass
+
+
+class _LockedConnectionManager:
+    """Serializes the calls to a connection manager that is shared between threads."""
+
+    def __init__(self, connection_manager: Any) -> None:
+        self._connection_manager = connection_manager
+        self._lock = threading.Lock()
+
+    def get_socket(self, *args: Any, **kwargs: Any) -> SocketType:
+        """Get a socket from the connection manager."""
+        with self._lock:
+            return self._connection_manager.get_socket(*args, **kwargs)
+
+    def free_socket(self, socket: SocketType) -> None:
+        """Give a socket back to the connection manager for reuse."""
+        with self._lock:
+            self._connection_manager.free_socket(socket)
+
+    def close_socket(self, socket: SocketType) -> None:
+        """Close a socket and remove it from the connection manager."""
+        with self._lock:
+            self._connection_manager.close_socket(socket)
+
+    @property
+    def managed_socket_count(self) -> Optional[int]:
+        """How many sockets the connection manager has open, if it says."""
+        return getattr(self._connection_manager, "managed_socket_count", None)
+
+
+class _Flight:
+    """A request that is in flight for callers that asked for the same thing at once."""
+
+    def __init__(self) -> None:
+        self.done = threading.Event() if threading else None
+        self.data = None
+        self.error = None
+
+
 class OutOfRetries(Exception):
     """Raised when requests has retried to make a request unsuccessfully."""
 
 
+class TooManyRedirects(Exception):
+    """Raised when a request is redirected more times than the session allows."""
+
+
+class Retry:
+    """How a session retries requests that fail or get a response that asks to try again later.
+
+    The default makes a second attempt right away for every method when sending the request or
+    receiving the first byte of the response fails, which is what sessions have always done.
+
+    :param int total: The most attempts made for one request, including the first.
+    :param float backoff_factor: The delay in seconds before the first retry. It doubles for each
+      retry after that.
+    :param float backoff_max: The longest delay in seconds before a retry, including one asked
+      for with ``Retry-After``.
+    :param float jitter: Up to this fraction of each delay is taken off at random, so that many
+      devices retrying at once spread out.
+    :param status_forcelist: Status codes, such as 429 and 503, whose responses are closed and
+      the request retried. The last attempt's response is returned whatever its status.
+    :param allowed_methods: The methods that are retried, or None for every method. Use
+      ``Retry.IDEMPOTENT_METHODS`` to never repeat a POST or PATCH that may have reached the
+      server.
+    :param phases: Where a failure must happen for the request to be retried: ``"connect"``
+      (getting a socket), ``"send"`` (sending the request) or ``"first_byte"`` (waiting for
+      the response).
+    :param bool respect_retry_after: When True, a ``Retry-After`` header given in seconds on a
+      response in ``status_forcelist`` is used as the delay instead of the backoff. HTTP dates
+      are not parsed and fall back to the backoff.
+    """
+
+    IDEMPOTENT_METHODS = ("DELETE", "GET", "HEAD", "OPTIONS", "PUT", "TRACE")
+
+    def __init__(  # noqa: PLR0913 Too many arguments in function definition
+        self,
+        total: int = 2,
+        backoff_factor: float = 0,
+        backoff_max: float = 120,
+        jitter: float = 0,
+        status_forcelist: Sequence[int] = (),
+        allowed_methods: Optional[Sequence[str]] = None,
+        phases: Sequence[str] = ("send", "first_byte"),
+        respect_retry_after: bool = True,
+    ) -> None:
+        if total < 1:
+            raise ValueError("total must be at least 1")
+        for phase in phases:
+            if phase not in ("connect", "send", "first_byte"):
+                raise ValueError(f"Unknown retry phase {phase}")
+        self.total = total
+        self.backoff_factor = backoff_factor
+        self.backoff_max = backoff_max
+        self.jitter = jitter
+        self.status_forcelist = tuple(status_forcelist)
+        self.allowed_methods = None if allowed_methods is None else tuple(allowed_methods)
+        self.phases = tuple(phases)
+        self.respect_retry_after = respect_retry_after
+
+    def allows(self, method: str) -> bool:
+        """Whether requests with method may be retried."""
+        return self.allowed_methods is None or method.upper() in self.allowed_methods
+
+    def delay(self, retries: int, retry_after: Optional[str] = None) -> float:
+        """The seconds to wait before retry number retries, counting from 1. retry_after is the
+        value of the Retry-After header of the response being retried, if any."""
+        if retry_after is not None and self.respect_retry_after:
+            try:
+                return min(max(int(retry_after), 0), self.backoff_max)
+            except ValueError:
+                pass
+        delay = min(self.backoff_factor * 2 ** (retries - 1), self.backoff_max)
+        if self.jitter:
+            delay *= 1 - self.jitter * random.random()
+        return delay
+
+
 class Response:
     """The response from a request, contains all the headers/content"""
 
@@ -108,13 +595,24 @@ class Response:
         self._cached = None
         self._headers = {}
         self._method = method
-
-        # _start_index and _receive_buffer are used when parsing headers.
-        # _receive_buffer will grow by 32 bytes everytime it is too small.
-        self._received_length = 0
-        self._receive_buffer = bytearray(32)
+        self._session = session
+        # The connection the response holds in a session with max_open_responses above 1.
+        self._lease = None
+
+        # _receive_start, _receive_end and _receive_buffer are used when parsing headers.
+        # Bytes between the start and end offsets have been received but not consumed yet.
+        # Unread bytes are only moved to the front when the buffer needs to be refilled and
+        # _receive_buffer doubles in size everytime it is too small, up to the session's
+        # max_receive_buffer_size.
+        self._receive_start = 0
+        self._receive_end = 0
+        self._receive_buffer = bytearray(session._receive_buffer_size)
         self._remaining = None
         self._chunked = False
+        # Set by the session when it has listeners, to report the end of the content.
+        self._request_id = None
+        self._received = 0
+        self._completed = False
 
         http = self._readto(b" ")
         if not http:
@@ -126,7 +624,10 @@ class Response:
         """The status reason returned by the server"""
         self._parse_headers()
         self._raw = None
-        self._session = session
+        self._decoder = None
+        encoding = self._headers.get("content-encoding", "").lower()
+        if session._decompress and encoding in DECOMPRESS_ENCODINGS and self._remaining != 0:
+            self._decoder = _Decompressor(self, encoding)
 
     def __enter__(self) -> "Response":
         return self
@@ -144,52 +645,80 @@ class Response:
 
     def _readto(self, stop: bytes) -> bytearray:
         buf = self._receive_buffer
-        end = self._received_length
+        start = self._receive_start
+        end = self._receive_end
+        search_start = start
         while True:
-            i = buf.find(stop, 0, end)
+            i = buf.find(stop, search_start, end)
             if i >= 0:
-                # Stop was found. Return everything up to but not including stop.
-                result = buf[:i]
-                new_start = i + len(stop)
-                # Remove everything up to and including stop from the buffer.
-                new_end = end - new_start
-                buf[:new_end] = buf[new_start:end]
-                self._received_length = new_end
+                # Stop was found. Return everything up to but not including stop and move the
+                # read cursor past it. The rest of the buffer is left where it is.
+                result = buf[start:i]
+                self._advance_receive_start(i + len(stop))
                 return result
 
-            # Not found so load more bytes.
-            # If our buffer is full, then make it bigger to load more.
+            # Not found so load more bytes. Don't search what was already searched again.
+            search_start = max(start, end - len(stop) + 1)
             if end == len(buf):
-                new_buf = bytearray(len(buf) + 32)
-                new_buf[: len(buf)] = buf
-                buf = new_buf
-                self._receive_buffer = buf
+                if start:
+                    # Make room by moving the unread bytes to the front of the buffer.
+                    buf[: end - start] = buf[start:end]
+                    end -= start
+                    search_start -= start
+                    start = 0
+                    self._receive_start = 0
+                    self._receive_end = end
+                else:
+                    # If our buffer is full, then make it bigger to load more.
+                    buf = self._grow_receive_buffer()
 
             read = self._recv_into(memoryview(buf)[end:])
             if read == 0:
-                self._received_length = 0
-                return buf[:end]
+                self._receive_start = self._receive_end = 0
+                return buf[start:end]
             end += read
+            self._receive_end = end
+
+    def _advance_receive_start(self, start: int) -> None:
+        if start >= self._receive_end:
+            # Everything buffered has been consumed, so start over at the front.
+            self._receive_start = self._receive_end = 0
+        else:
+            self._receive_start = start
+
+    def _grow_receive_buffer(self) -> bytearray:
+        buf = self._receive_buffer
+        limit = self._session._max_receive_buffer_size
+        if len(buf) >= limit:
+            # The rest of the response can't be parsed, so the socket can't be reused.
+            self._session._connection_manager.close_socket(self.socket)
+            self.socket = None
+            raise RuntimeError(
+                f"Response header line is larger than max_receive_buffer_size ({limit} bytes)"
+            )
+        new_buf = bytearray(min(len(buf) * 2, limit))
+        new_buf[: len(buf)] = buf
+        self._receive_buffer = new_buf
+        return new_buf
 
     def _read_from_buffer(
         self, buf: Optional[bytearray] = None, nbytes: Optional[int] = None
     ) -> int:
-        if self._received_length == 0:
+        start = self._receive_start
+        read = min(self._receive_end - start, nbytes)
+        if read <= 0:
             return 0
-        read = self._received_length
-        read = min(read, nbytes)
-        membuf = memoryview(self._receive_buffer)
         if buf:
-            buf[:read] = membuf[:read]
-        if read < self._received_length:
-            new_end = self._received_length - read
-            self._receive_buffer[:new_end] = membuf[read : self._received_length]
-            self._received_length = new_end
-        else:
-            self._received_length = 0
+            buf[:read] = memoryview(self._receive_buffer)[start : start + read]
+        self._advance_receive_start(start + read)
         return read
 
     def _readinto(self, buf: bytearray) -> int:
+        if self._decoder:
+            return self._decoder.readinto(buf)
+        return self._read_body(buf)
+
+    def _read_body(self, buf: bytearray) -> int:
         if not self.socket:
             raise RuntimeError("Newer Response closed this one. Use Responses immediately.")
 
@@ -203,7 +732,10 @@ class Response:
                 http_chunk_size = int(bytes(chunk_header), 16)
                 if http_chunk_size == 0:
                     self._chunked = False
+                    self._remaining = 0
                     self._parse_headers()
+                    if self._request_id is not None and not self._completed:
+                        self._body_complete()
                     return 0
                 self._remaining = http_chunk_size
             elif self._remaining is None:
@@ -224,33 +756,125 @@ class Response:
         if self._remaining:
             # if Content-Length was provided, adjust the remaining amount to still read
             self._remaining -= read
+        if self._request_id is not None and not self._completed:
+            self._count_content(read)
 
         return read
 
-    def _throw_away(self, nbytes: int) -> None:
+    def _count_content(self, read: int) -> None:
+        self._received += read
+        if (self._remaining is None and not read) or (self._remaining == 0 and not self._chunked):
+            self._body_complete()
+
+    def _body_complete(self) -> None:
+        self._completed = True
+        self._session._emit("body_complete", request=self._request_id, bytes=self._received)
+
+    def readinto(self, buf: WriteableBuffer) -> int:
+        """Read the content into ``buf`` until it is full or the content ends. Returns the
+        number of bytes read, which is 0 once all of the content has been read.
+
+        Bytes that were buffered while parsing the headers are copied first, after that the
+        socket receives directly into ``buf``, so no intermediate objects are allocated."""
+        view = memoryview(buf)
+        end = 0
+        while end < len(view):
+            read = self._readinto(view[end:])
+            if read == 0:
+                break
+            end += read
+        return end
+
+    def readinto_exact(self, buf: WriteableBuffer) -> None:
+        """Fill all of ``buf`` with content, like `readinto`. Raises `EOFError` if the content
+        ends before ``buf`` is full."""
+        read = self.readinto(buf)
+        if read < len(buf):
+            raise EOFError(f"Content ended after {read} of {len(buf)} bytes")
+
+    def _throw_away(self, nbytes: int, buf: Optional[bytearray] = None) -> None:
         nbytes -= self._read_from_buffer(nbytes=nbytes)
 
-        buf = self._receive_buffer
+        if buf is None:
+            buf = self._receive_buffer
         len_buf = len(buf)
-        for _ in range(nbytes // len_buf):
-            to_read = len_buf
-            while to_read > 0:
-                to_read -= self._recv_into(buf, to_read)
-        to_read = nbytes % len_buf
-        while to_read > 0:
-            to_read -= self._recv_into(buf, to_read)
+        while nbytes > 0:
+            read = self._recv_into(buf, min(nbytes, len_buf))
+            if read == 0:
+                raise RuntimeError("Connection closed before the content ended")
+            nbytes -= read
 
     def close(self) -> None:
         """Close out the socket. If we have a session free it instead."""
-        if not self.socket:
-            return
-
-        if self._session:
-            self._session._connection_manager.free_socket(self.socket)
-        else:
-            self.socket.close()
-
-        self.socket = None
+        try:
+            if not self.socket:
+                return
+
+            kept = False
+            if not self._session or isinstance(self.socket, _BufferSocket):
+                self.socket.close()
+            elif self._session._finish(self):
+                self._session._connection_manager.free_socket(self.socket)
+                kept = True
+            else:
+                self._session._connection_manager.close_socket(self.socket)
+
+            self.socket = None
+            if self._request_id is not None:
+                self._session._emit(
+                    "closed", request=self._request_id, kept=kept, bytes=self._received
+                )
+        finally:
+            # Only once the socket is free can another response be given the lease's session id.
+            if self._lease is not None:
+                self._session._release_lease(self._lease)
+                self._lease = None
+
+    def _drain(self, limit: int, buf: bytearray) -> Optional[int]:
+        """Read and discard the rest of the content so the socket can be reused. Returns how
+        many bytes were discarded, or None if more than limit are left or the connection closed
+        first. The content must have a Content-Length or be chunked."""
+        drained = 0
+        while True:
+            if not self._chunked:
+                remaining = self._remaining
+                if drained + remaining > limit:
+                    return None
+                # _remaining is left as it was so reading the closed response still raises.
+                self._throw_away(remaining, buf)
+                # Chunked content is counted by _read_body.
+                self._received += remaining
+                return drained + remaining
+            read = self._read_body(buf)
+            if read == 0:
+                # Either the last chunk was read or the connection was closed.
+                return None if self._chunked else drained
+            drained += read
+            if drained > limit:
+                return None
+
+    def _serialize(self) -> bytes:
+        """Read the content and return the whole response as it could have been received, with
+        a Content-Length instead of chunks and without the Content-Encoding if it was
+        decompressed. The response is closed. A response that has no content, such as the
+        response to a HEAD, keeps its headers as they were."""
+        content = self.content
+        has_content = not (
+            self._method == "HEAD"
+            or self.status_code in (204, 304)
+            or 100 <= self.status_code < 200
+        )
+        skipped = ["content-length", "transfer-encoding"] if has_content else []
+        if self._decoder is not None:
+            skipped.append("content-encoding")
+        head = [f"HTTP/1.1 {self.status_code} {str(self.reason, 'utf-8')}\r\n"]
+        for title, value in self._headers.items():
+            if title not in skipped:
+                head.append(f"{title}: {value}\r\n")
+        if has_content:
+            head.append(f"content-length: {len(content)}\r\n")
+        head.append("\r\n")
+        return bytes("".join(head), "utf-8") + content
 
     def _parse_headers(self) -> None:
         """
@@ -283,10 +907,12 @@ class Response:
             or self._method == "HEAD"
         ):
             self._remaining = 0
+            self._chunked = False
 
     def _validate_not_gzip(self) -> None:
-        """gzip encoding is not supported. Raise an exception if found."""
-        if "content-encoding" in self.headers and self.headers["content-encoding"] == "gzip":
+        """gzip encoding is only supported when the session decompresses. Raise an exception if
+        found otherwise."""
+        if self._decoder is None and self.headers.get("content-encoding") == "gzip":
             raise ValueError(
                 "Content-encoding is gzip, data cannot be accessed as json or text. "
                 "Use content property to access raw bytes."
@@ -308,9 +934,29 @@ class Response:
                 return self._cached
             raise RuntimeError("Cannot access content after getting text or json")
 
-        self._cached = b"".join(self.iter_content(chunk_size=32))
+        self._cached = self._read_all()
+        self.close()
         return self._cached
 
+    def _read_all(self) -> bytes:
+        if self._decoder is None and self._remaining is not None and not self._chunked:
+            # The length is known so read straight from the socket into a buffer of that size.
+            buf = bytearray(self._remaining)
+            end = self.readinto(buf)
+            if end < len(buf):
+                # The server closed the connection early.
+                return bytes(memoryview(buf)[:end])
+            return bytes(buf)
+
+        # Chunked or no length given, collect the body until the end of it is found.
+        result = bytearray()
+        chunk = bytearray(CONTENT_CHUNK_SIZE)
+        while True:
+            read = self._readinto(chunk)
+            if read == 0:
+                return bytes(result)
+            result.extend(memoryview(chunk)[:read])
+
     @property
     def text(self) -> str:
         """The HTTP content, encoded into a string according to the HTTP
@@ -325,8 +971,19 @@ class Response:
         self._cached = str(self.content, self.encoding)
         return self._cached
 
-    def json(self) -> Any:
-        """The HTTP content, parsed into a json dictionary"""
+    def json(self, select: Optional[Sequence[Union[str, int]]] = None) -> Any:
+        """The HTTP content, parsed into a json dictionary
+
+        ``select`` is a path of object keys and list indices, such as
+        ``["data", 0, "price"]``. When given, only the value at the end of the path is parsed
+        and returned. The content is streamed through a small buffer and everything before
+        the value is skipped without being parsed, so the whole document never needs to fit
+        in memory. Raises `KeyError` or `IndexError` if the path isn't in the document. The
+        rest of the content is left unread, so ``select`` can only be used once per response.
+        """
+        if select is not None:
+            return self._select_json(select)
+
         # The cached JSON will be a list or dictionary.
         if self._cached:
             if isinstance(self._cached, (list, dict)):
@@ -338,11 +995,24 @@ class Response:
         self._validate_not_gzip()
 
         obj = json_module.load(self._raw)
-        if not self._cached:
-            self._cached = obj
+        # Reading may have cached the raw content along the way, the parsed object replaces it.
+        self._cached = obj
 
         return obj
 
+    def _select_json(self, select: Sequence[Union[str, int]]) -> Any:
+        if self._cached is not None:
+            if not isinstance(self._cached, (list, dict)):
+                raise RuntimeError("Cannot access json after getting text or content")
+            obj = self._cached
+            for key in select:
+                obj = obj[key]
+            return obj
+
+        self._validate_not_gzip()
+
+        return _JSONStream(self).select(select)
+
     def iter_content(self, chunk_size: int = 1, decode_unicode: bool = False) -> bytes:
         """An iterator that will stream data by only reading 'chunk_size'
         bytes and yielding them, when we can't buffer the whole datastream"""
@@ -362,57 +1032,691 @@ class Response:
         self.close()
 
 
-class Session:
-    """HTTP session that shares sockets and ssl context."""
+class CacheEntry:
+    """A response stored in a cache.
+
+    :param bytes data: The whole response, status line, headers and content.
+    :param float expires: The `time.monotonic` time until which the response can be used
+      without revalidating it with the server.
+    """
+
+    def __init__(self, data: bytes, expires: float = 0) -> None:
+        self.data = data
+        self.expires = expires
+        self.headers = {}
+        """The response headers, with lower case names"""
+        head = bytes(memoryview(data)[: data.find(b"\r\n\r\n")])
+        for line in head.split(b"\r\n")[1:]:
+            title, content = line.split(b":", 1)
+            self.headers[str(title, "utf-8").lower()] = str(content.strip(), "utf-8")
+
+    def fresh(self) -> bool:
+        """Whether the entry can be used without revalidating it."""
+        return time.monotonic() < self.expires
+
+
+class MemoryCache:
+    """A least recently used response cache kept in memory.
+
+    :param int max_size: The total size in bytes of the responses kept. The least recently used
+      responses are dropped to make room for new ones.
+    """
+
+    def __init__(self, max_size: int = 16384) -> None:
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._size = 0
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """Return the entry stored for key, or None."""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            # Move it to the most recently used end.
+            self._entries[key] = entry
+        return entry
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        """Store entry for key, replacing any entry already stored."""
+        self.delete(key)
+        if len(entry.data) > self.max_size:
+            return
+        self._entries[key] = entry
+        self._size += len(entry.data)
+        while self._size > self.max_size:
+            self.delete(next(iter(self._entries)))
+
+    def delete(self, key: str) -> None:
+        """Remove the entry stored for key, if any."""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= len(entry.data)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._entries = OrderedDict()
+        self._size = 0
+
+
+class FileCache:
+    """A least recently used response cache that stores responses as files in a directory.
+
+    Stored responses survive restarts but how long they stay fresh does not, so responses
+    stored by an earlier run are always revalidated with the server before they are used.
+
+    :param str directory: Where to store the responses. It is created if needed.
+    :param int max_size: The total size in bytes of the responses kept.
+    """
+
+    def __init__(self, directory: str, max_size: int = 65536) -> None:
+        self.max_size = max_size
+        self._directory = directory.rstrip("/")
+        # file name -> [size, expires]
+        self._index = OrderedDict()
+        try:
+            os.mkdir(self._directory)
+        except OSError:
+            pass  # Already exists
+        for name in sorted(os.listdir(self._directory)):
+            if name.endswith(".http"):
+                self._index[name] = [os.stat(self._path(name))[6], 0]
+        self._evict()
+
+    def _path(self, name: str) -> str:
+        return f"{self._directory}/{name}"
+
+    @staticmethod
+    def _name(key: str) -> str:
+        # 32 bit FNV-1a, which is stable across runs unlike hash()
+        value = 0x811C9DC5
+        for byte in bytes(key, "utf-8"):
+            value = ((value ^ byte) * 0x01000193) & 0xFFFFFFFF
+        return f"{value:08x}.http"
+
+    def _evict(self) -> None:
+        size = sum(info[0] for info in self._index.values())
+        while size > self.max_size:
+            name = next(iter(self._index))
+            size -= self._index.pop(name)[0]
+            try:
+                os.remove(self._path(name))
+            except OSError:
+                pass
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """Return the entry stored for key, or None."""
+        name = self._name(key)
+        info = self._index.pop(name, None)
+        if info is None:
+            return None
+        try:
+            with open(self._path(name), "rb") as file:
+                stored_key = file.readline()
+                data = file.read()
+        except OSError:
+            return None
+        if str(stored_key, "utf-8").rstrip("\n") != key:
+            # Another key with the same hash replaced it.
+            self._index[name] = info
+            return None
+        self._index[name] = info
+        return CacheEntry(data, info[1])
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        """Store entry for key, replacing any entry already stored."""
+        name = self._name(key)
+        size = len(entry.data)
+        if size > self.max_size:
+            self.delete(key)
+            return
+        self._index.pop(name, None)
+        with open(self._path(name), "wb") as file:
+            file.write(bytes(key, "utf-8") + b"\n")
+            file.write(entry.data)
+        self._index[name] = [size, entry.expires]
+        self._evict()
+
+    def delete(self, key: str) -> None:
+        """Remove the entry stored for key, if any."""
+        name = self._name(key)
+        if self._index.pop(name, None) is not None:
+            try:
+                os.remove(self._path(name))
+            except OSError:
+                pass
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        for name in self._index:
+            try:
+                os.remove(self._path(name))
+            except OSError:
+                pass
+        self._index = OrderedDict()
+
+
+class MultipartEncoder:
+    """A ``multipart/form-data`` body that is laid out once. The part headers are encoded
+    when it is created and the size of each file is found then, so it can be measured with
+    ``len()`` and sent again, or retried, without reading or seeking around its files first.
+    Files are sized with `os.stat` when they have a ``name`` and rewound before being sent.
+
+    ``fields`` has the same form as the ``files`` argument of `Session.request`, a dictionary
+    of field names to ``(filename, value)``, ``(filename, value, content_type)`` or
+    ``(filename, value, content_type, headers)``. A value is a string, a bytes-like object or
+    a file opened in binary mode. Send it as ``data``:
+
+    .. code-block:: python
+
+        with open("/photo.jpg", "rb") as photo:
+            body = adafruit_requests.MultipartEncoder({"photo": ("photo.jpg", photo, "image/jpeg")})
+            requests.post(url, data=body)
+
+    :param str boundary: The boundary between parts. A random one is used when not given.
+    """
+
+    def __init__(self, fields: Dict[str, tuple], boundary: Optional[str] = None) -> None:
+        self.boundary = boundary or Session._build_boundary_string()
+        # Encoded headers and separators alternate with the values sent between them.
+        self._parts = []
+        self._length = 0
+        head = []
+        for field_name, field_values in fields.items():
+            head.append(f'--{self.boundary}\r\nContent-Disposition: form-data; name="{field_name}"')
+            if field_values[0] is not None:
+                head.append(f'; filename="{field_values[0]}"')
+            head.append("\r\n")
+            if len(field_values) >= 3:
+                head.append(f"Content-Type: {field_values[2]}\r\n")
+            if len(field_values) >= 4:
+                for header, value in field_values[3].items():
+                    head.append(f"{header}: {value}\r\n")
+            head.append("\r\n")
+
+            value = field_values[1]
+            if value is None or isinstance(value, str):
+                head.append(value or "")
+            else:
+                self._add_part(head, value)
+                head = []
+            head.append("\r\n")
+        head.append(f"--{self.boundary}--\r\n")
+        self._add_part(head)
+
+    def _add_part(self, head: List[str], value: Any = None) -> None:
+        encoded = bytes("".join(head), "utf-8")
+        self._parts.append(encoded)
+        self._length += len(encoded)
+        if value is None:
+            return
+        self._parts.append(value)
+        body = Session._as_buffer(value)
+        if body is not None:
+            self._length += len(body)
+        else:
+            self._length += self._file_length(value)
+
+    @staticmethod
+    def _file_length(file_handle: IO) -> int:
+        mode = getattr(file_handle, "mode", "b")
+        if isinstance(mode, str) and "b" not in mode:
+            raise ValueError("Files must be opened in binary mode")
+        # Wrapped streams, such as gzip files, are named after a file of a different length.
+        name = getattr(file_handle, "name", None)
+        if isinstance(file_handle, _PLAIN_FILES) and isinstance(name, str):
+            try:
+                return os.stat(name)[6]
+            except OSError:
+                pass
+        return Session._get_file_length(file_handle)
+
+    def __len__(self) -> int:
+        return self._length
+
+    @property
+    def content_type(self) -> str:
+        """The Content-Type header for the body, including the boundary."""
+        return f"multipart/form-data; boundary={self.boundary}"
+
+    def _send(self, session: "Session", writer: _RequestWriter) -> None:
+        for i, part in enumerate(self._parts):
+            if i % 2 == 0:
+                writer.write(part)
+                continue
+            body = session._as_buffer(part)
+            if body is not None:
+                session._send_body(writer, body)
+            else:
+                part.seek(0)
+                writer.flush()
+                session._send_file(writer.socket, part)
+
+
+class EventHistograms:
+    """A listener for `Session.add_listener` that collects how long each phase of a request takes
+    into histograms.
+
+    The phases are ``connect`` (getting a socket, including DNS and TLS), ``send`` (sending the
+    request), ``first_byte`` (waiting for the server to start answering), ``headers`` (reading
+    the response headers), ``body`` (reading the content) and ``total``. Only requests whose
+    content is read to the end are counted.
+
+    :param bounds: The upper bounds, in seconds, of the histogram buckets. There is one more
+      bucket for durations longer than the last bound.
+    """
+
+    PHASES = (
+        ("connect", "connect_start", "connect_end"),
+        ("send", "connect_end", "body_sent"),
+        ("first_byte", "body_sent", "first_byte"),
+        ("headers", "first_byte", "headers_parsed"),
+        ("body", "headers_parsed", "body_complete"),
+        ("total", "start", "body_complete"),
+    )
 
     def __init__(
+        self,
+        bounds: Sequence[float] = (
+            0.001,
+            0.002,
+            0.005,
+            0.01,
+            0.02,
+            0.05,
+            0.1,
+            0.2,
+            0.5,
+            1,
+            2,
+            5,
+        ),
+    ) -> None:
+        self.bounds = tuple(bounds)
+        self.counts = {}
+        """The number of durations in each bucket, by phase."""
+        self.sums = {}
+        """The total of the durations in seconds, by phase."""
+        self._lock = threading.Lock() if threading else _NoLock()
+        # The times of the events so far, by request id.
+        self._requests = {}
+        self.clear()
+
+    def __call__(self, name: str, request: int, time: float, **fields: Any) -> None:
+        times = self._requests.get(request)
+        if times is None:
+            times = self._requests[request] = {"start": time}
+        times[name] = time
+        if name == "body_complete":
+            for phase, start, end in self.PHASES:
+                if start in times and end in times:
+                    self.observe(phase, times[end] - times[start])
+        if name in ("body_complete", "closed", "failed"):
+            self._requests.pop(request, None)
+
+    def observe(self, phase: str, seconds: float) -> None:
+        """Add a duration to the histogram of phase."""
+        bucket = 0
+        for bound in self.bounds:
+            if seconds <= bound:
+                break
+            bucket += 1
+        with self._lock:
+            self.counts[phase][bucket] += 1
+            self.sums[phase] += seconds
+
+    def count(self, phase: str) -> int:
+        """How many durations were added for phase."""
+        return sum(self.counts[phase])
+
+    def percentile(self, phase: str, percent: float) -> Optional[float]:
+        """The upper bound of the bucket that holds the given percent of the durations of phase,
+        or None if there are none. Durations past the last bound give ``float("inf")``."""
+        total = self.count(phase)
+        if not total:
+            return None
+        seen = 0
+        for bucket, count in enumerate(self.counts[phase]):
+            seen += count
+            if seen * 100 >= total * percent:
+                break
+        return self.bounds[bucket] if bucket < len(self.bounds) else float("inf")
+
+    def clear(self) -> None:
+        """Forget every duration added so far."""
+        with self._lock:
+            for phase, _, _ in self.PHASES:
+                self.counts[phase] = [0] * (len(self.bounds) + 1)
+                self.sums[phase] = 0.0
+
+
+class SessionMetrics:
+    """A listener for `Session.add_listener` that counts what a session's requests did. A
+    session made with ``metrics=True`` has one as `Session.metrics`.
+
+    The counters, by name in `snapshot`, are the responses received by status class
+    (``responses_1xx`` to ``responses_5xx``), the ``bytes_sent`` in requests, the content
+    ``bytes_received`` (including drained content), how many sockets were newly connected
+    (``connections_new``) or reused (``connections_reused``), the ``retries`` made after a
+    failed attempt, the ``redirects`` followed, and how many responses closed with unread
+    content were ``drained`` or had their socket closed (``drain_closes``).
+    """
+
+    COUNTERS = (
+        "responses_1xx",
+        "responses_2xx",
+        "responses_3xx",
+        "responses_4xx",
+        "responses_5xx",
+        "bytes_sent",
+        "bytes_received",
+        "connections_new",
+        "connections_reused",
+        "retries",
+        "redirects",
+        "drained",
+        "drain_closes",
+    )
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock() if threading else _NoLock()
+        self._counters = {}
+        self.reset()
+
+    def __call__(self, name: str, request: int, time: float, **fields: Any) -> None:
+        updates = ()
+        if name == "connect_end":
+            updates = (("connections_reused" if fields["reused"] else "connections_new", 1),)
+        elif name in ("head_sent", "body_sent"):
+            updates = (("bytes_sent", fields["bytes"]),)
+        elif name == "headers_parsed":
+            status_class = fields["status_code"] // 100
+            if 1 <= status_class <= 5:
+                updates = ((f"responses_{status_class}xx", 1),)
+        elif name == "retry":
+            updates = (("retries", 1),)
+        elif name == "redirect":
+            updates = (("redirects", 1),)
+        elif name == "drain":
+            if fields["bytes"] is None:
+                updates = (("drain_closes", 1),)
+            else:
+                # The drained bytes are counted by the closed event.
+                updates = (("drained", 1),)
+        elif name == "closed":
+            updates = (("bytes_received", fields["bytes"]),)
+        if updates:
+            with self._lock:
+                for counter, amount in updates:
+                    self._counters[counter] += amount
+
+    def snapshot(self) -> Dict[str, int]:
+        """A copy of the counters, by name."""
+        with self._lock:
+            return dict(self._counters)
+
+    def reset(self) -> None:
+        """Set every counter back to 0."""
+        with self._lock:
+            self._counters = {name: 0 for name in self.COUNTERS}
+
+    def prometheus(self, prefix: str = "adafruit_requests") -> str:
+        """The counters in the Prometheus text exposition format, with metric names starting
+        with prefix."""
+        counters = self.snapshot()
+        families = (
+            (
+                "responses",
+                "Responses received by status class.",
+                [
+                    (f'{{class="{number}xx"}}', counters[f"responses_{number}xx"])
+                    for number in range(1, 6)
+                ],
+            ),
+            ("sent_bytes", "Bytes sent in requests.", [("", counters["bytes_sent"])]),
+            ("received_bytes", "Content bytes received.", [("", counters["bytes_received"])]),
+            (
+                "connections",
+                "Sockets used for requests, by whether they were reused.",
+                [
+                    ('{reused="true"}', counters["connections_reused"]),
+                    ('{reused="false"}', counters["connections_new"]),
+                ],
+            ),
+            ("retries", "Attempts made after a failed attempt.", [("", counters["retries"])]),
+            ("redirects", "Redirects followed.", [("", counters["redirects"])]),
+            (
+                "drains",
+                "Responses closed with unread content, by what happened to their socket.",
+                [
+                    ('{result="drained"}', counters["drained"]),
+                    ('{result="closed"}', counters["drain_closes"]),
+                ],
+            ),
+        )
+        lines = []
+        for name, help_text, samples in families:
+            full_name = f"{prefix}_{name}_total"
+            lines.append(f"# HELP {full_name} {help_text}")
+            lines.append(f"# TYPE {full_name} counter")
+            for labels, value in samples:
+                lines.append(f"{full_name}{labels} {value}")
+        return "\n".join(lines) + "\n"
+
+
+class Session:
+    """HTTP session that shares sockets and ssl context.
+
+    :param int request_buffer_size: When non-zero, each request is serialized into a reusable
+      buffer of this many bytes so the request line and headers are sent with a single socket
+      send. Bodies that fit in the remaining space are included in the same send.
+    :param int receive_buffer_size: The initial size of each response's header buffer. The
+      buffer doubles in size whenever a header line does not fit.
+    :param int max_receive_buffer_size: The largest the header buffer may grow. A response
+      with a longer header line raises a `RuntimeError` and its socket is closed.
+    :param bool decompress: When True, requests advertise ``Accept-Encoding: gzip, deflate``
+      and compressed content is decompressed as it is read by `Response.iter_content`,
+      `Response.content`, `Response.text` and `Response.json`. Raises `ValueError` if the
+      platform has neither ``zlib.decompressobj`` nor ``deflate``.
+    :param cache: A `MemoryCache`, `FileCache` or other object with the same ``get``, ``set``
+      and ``delete`` methods and ``max_size`` attribute. When given, GET requests without
+      ``stream=True`` are cached. Responses are stored with their ``ETag`` and
+      ``Last-Modified`` validators, later requests send ``If-None-Match`` and
+      ``If-Modified-Since`` and a ``304 Not Modified`` is answered from the cache. Responses
+      that are still fresh according to ``Cache-Control: max-age`` are returned without
+      contacting the server. Responses served from the cache have their content buffered.
+    :param int max_open_responses: How many responses may be open at once. With the default
+      of 1, every request closes the previous response. Above 1, each response keeps its own
+      socket until it is closed, so a long download can be streamed while other requests are
+      made. A request that would go over the limit raises a `RuntimeError`.
+    :param int max_open_responses_per_host: How many of the open responses may be from the
+      same host and port. Defaults to ``max_open_responses``.
+    :param bool coalesce: When True, GET and HEAD requests without ``stream=True`` or a body
+      that are made from several threads at once for the same url and headers share one
+      request. Each caller gets its own response with the content buffered. See
+      `coalesce_stats`.
+    :param int upload_chunk_size: The size of the reads made from files sent as ``data`` or
+      ``files``. Each read is sent straight from one buffer that is reused for every upload.
+    :param bool stream_json: When True, ``json`` bodies are encoded a piece at a time and sent
+      through the upload buffer instead of being encoded into one string first. The encoding
+      is done twice, once to find the Content-Length, so it takes longer but the document
+      never needs to fit in memory.
+    :param int max_redirects: How many redirects a request follows before raising
+      `TooManyRedirects`.
+    :param int redirect_cache_size: How many permanent (301 and 308) redirects to remember.
+      Later requests for a remembered url go straight to where it was redirected.
+    :param int drain_limit: When a response is closed before all of its content is read, the
+      rest is read and thrown away if it is no longer than this many bytes, so the socket can
+      be reused. Otherwise the socket is closed and the next request to the host reconnects.
+      See `drain_stats`.
+    :param bool metrics: When True, the session counts what its requests do in `metrics`.
+    :param Retry retry: When and how often requests are retried. Defaults to ``Retry()``.
+    """
+
+    def __init__(  # noqa: PLR0913 Too many arguments in function definition
         self,
         socket_pool: SocketpoolModuleType,
         ssl_context: Optional[SSLContextType] = None,
         session_id: Optional[str] = None,
+        request_buffer_size: int = 0,
+        receive_buffer_size: int = 32,
+        max_receive_buffer_size: int = 16384,
+        decompress: bool = False,
+        cache: Optional[MemoryCache] = None,
+        max_open_responses: int = 1,
+        max_open_responses_per_host: Optional[int] = None,
+        coalesce: bool = False,
+        upload_chunk_size: int = 4096,
+        stream_json: bool = False,
+        max_redirects: int = 30,
+        redirect_cache_size: int = 32,
+        drain_limit: int = 16384,
+        metrics: bool = False,
+        retry: Optional[Retry] = None,
     ) -> None:
         self._connection_manager = get_connection_manager(socket_pool)
         self._ssl_context = ssl_context
         self._session_id = session_id
         self._last_response = None
+        self._request_buffer = bytearray(request_buffer_size) if request_buffer_size else None
+        if not 0 < receive_buffer_size <= max_receive_buffer_size:
+            raise ValueError("receive_buffer_size must be between 1 and max_receive_buffer_size")
+        self._receive_buffer_size = receive_buffer_size
+        self._max_receive_buffer_size = max_receive_buffer_size
+        if decompress and not _Decompressor.supported():
+            raise ValueError("Decompression is not supported on this platform")
+        self._decompress = decompress
+        self._cache = cache
+        if max_open_responses < 1:
+            raise ValueError("max_open_responses must be at least 1")
+        self._max_open_responses = max_open_responses
+        self._max_open_responses_per_host = max_open_responses_per_host or max_open_responses
+        # The lease numbers of the open responses, by (proto, host, port).
+        self._leases = {}
+        self._lease_count = 0
+        # Guards the leases and request buffer when requests are made from threads.
+        self._lock = threading.Lock() if threading else _NoLock()
+        if upload_chunk_size < 1:
+            raise ValueError("upload_chunk_size must be at least 1")
+        self._upload_chunk_size = upload_chunk_size
+        self._upload_buffer = None
+        self._stream_json = stream_json
+        self._max_redirects = max_redirects
+        # Permanent redirects seen, by url, least recently used first.
+        self._redirects = OrderedDict()
+        self._redirect_cache_size = redirect_cache_size
+        self._drain_limit = drain_limit
+        self._retry = retry or Retry()
+        self._drained = 0
+        self._drained_bytes = 0
+        self._drain_closes = 0
+        self._coalesce = coalesce
+        self._in_flight = {}
+        self._coalesce_hits = 0
+        self._coalesce_misses = 0
+        # Called with each event of a request's lifecycle. Replaced rather than changed so
+        # events can be sent from other threads while listeners are added.
+        self._listeners = ()
+        self._request_ids = 0
+        self.metrics: Optional[SessionMetrics] = None
+        """The `SessionMetrics` of a session made with ``metrics=True``, otherwise None."""
+        if metrics:
+            self.metrics = SessionMetrics()
+            self.add_listener(self.metrics)
+        if coalesce:
+            self._make_thread_safe()
 
-    def _build_boundary_data(self, files: dict):  # pylint: disable=too-many-locals
-        boundary_string = self._build_boundary_string()
-        content_length = 0
-        boundary_objects = []
-
-        for field_name, field_values in files.items():
-            file_name = field_values[0]
-            file_handle = field_values[1]
-
-            boundary_objects.append(
-                f'--{boundary_string}\r\nContent-Disposition: form-data; name="{field_name}"'
-            )
-            if file_name is not None:
-                boundary_objects.append(f'; filename="{file_name}"')
-            boundary_objects.append("\r\n")
-            if len(field_values) >= 3:
-                file_content_type = field_values[2]
-                boundary_objects.append(f"Content-Type: {file_content_type}\r\n")
-            if len(field_values) >= 4:
-                file_headers = field_values[3]
-                for file_header_key, file_header_value in file_headers.items():
-                    boundary_objects.append(f"{file_header_key}: {file_header_value}\r\n")
-            boundary_objects.append("\r\n")
-
-            if hasattr(file_handle, "read"):
-                content_length += self._get_file_length(file_handle)
-
-            boundary_objects.append(file_handle)
-            boundary_objects.append("\r\n")
-
-        boundary_objects.append(f"--{boundary_string}--\r\n")
+    @property
+    def coalesce_stats(self) -> Dict[str, int]:
+        """How many requests were answered by a request already in flight (``hits``) and how
+        many were made (``misses``) since the session was created with ``coalesce=True``."""
+        return {"hits": self._coalesce_hits, "misses": self._coalesce_misses}
 
-        for boundary_object in boundary_objects:
-            if isinstance(boundary_object, str):
-                content_length += len(boundary_object)
+    @property
+    def drain_stats(self) -> Dict[str, int]:
+        """How many responses closed before their content was read had the rest drained so their
+        socket could be reused (``drained``), how many bytes that threw away (``bytes``) and how
+        many had their socket closed instead (``closed``). Responses without a Content-Length
+        or chunked encoding end when the connection closes, so they aren't counted."""
+        return {
+            "drained": self._drained,
+            "bytes": self._drained_bytes,
+            "closed": self._drain_closes,
+        }
+
+    def add_listener(self, listener: Callable[..., None]) -> None:
+        """Call ``listener(name, **fields)`` for each step of every request made from now on.
+        Every event has a ``request`` id, the same for all of the events of one request, and the
+        `time.monotonic` ``time`` it happened at. The events are, in order:
+
+        * ``connect_start`` and ``connect_end`` around getting a socket to ``host``, ``port``
+          and ``proto``, which includes DNS and TLS for a new connection. ``connect_end`` has
+          ``reused``, which is True when a socket left open by an earlier response was used.
+        * ``head_sent`` once the request line and headers are written, with their ``bytes``.
+          With a ``request_buffer_size`` they may go out in the same send as the body.
+        * ``body_sent`` once the whole request is sent, with the ``bytes`` of the body.
+        * ``first_byte`` when the first byte of the response is received.
+        * ``headers_parsed`` with the ``status_code`` once the response headers are read.
+        * ``body_complete`` with the content ``bytes`` once all of the content has been read.
+        * ``closed`` when the response is closed, with ``kept`` True if its socket was kept
+          open for the next request and the content ``bytes`` received, including any that
+          were drained.
+
+        When a request is retried, ``retry`` is sent with the ``attempt`` number, the ``phase``
+        the one before failed in (``connect``, ``send``, ``first_byte`` or ``status`` for a
+        response in ``status_forcelist``) and its ``error``, and the events happen again.
+        A response closed with unread content sends ``drain`` with the ``bytes`` thrown away,
+        or None if its socket was closed instead. Each redirect followed sends ``redirect``
+        with its ``status_code`` and ``location``, and the redirected request is a new request.
+        A request that raises before there is a response sends ``failed`` with the ``error``
+        instead of the response events.
+        Listeners are called on the thread making the request and should return quickly. See
+        `EventHistograms`."""
+        self._listeners = self._listeners + (listener,)
+
+    def remove_listener(self, listener: Callable[..., None]) -> None:
+        """Stop calling a listener added with `add_listener`."""
+        self._listeners = tuple(other for other in self._listeners if other is not listener)
+
+    def _emit(self, name: str, **fields: Any) -> None:
+        fields["time"] = time.monotonic()
+        for listener in self._listeners:
+            listener(name, **fields)
+
+    def _next_request_id(self) -> int:
+        with self._lock:
+            self._request_ids += 1
+            return self._request_ids
+
+    def _finish(self, response: Response) -> bool:
+        """Whether the socket of a response that is being closed can be reused. Content that
+        hasn't been read is drained if there's no more than drain_limit bytes of it."""
+        if response.headers.get("connection", "").lower() == "close":
+            return False
+        if not response._chunked:
+            if response._remaining is None:
+                # The content ends when the server closes the connection.
+                return False
+            if response._remaining == 0:
+                return True
+        buffer = self._take_upload_buffer()
+        try:
+            drained = response._drain(self._drain_limit, buffer)
+        except (OSError, RuntimeError, ValueError):
+            drained = None
+        finally:
+            self._upload_buffer = buffer
+        with self._lock:
+            if drained is None:
+                self._drain_closes += 1
+            else:
+                self._drained += 1
+                self._drained_bytes += drained
+        if response._request_id is not None:
+            self._emit("drain", request=response._request_id, bytes=drained)
+        return drained is not None
 
-        return boundary_string, content_length, boundary_objects
+    def _make_thread_safe(self) -> None:
+        if threading and not isinstance(self._connection_manager, _LockedConnectionManager):
+            self._connection_manager = _LockedConnectionManager(self._connection_manager)
 
     @staticmethod
     def _build_boundary_string():
@@ -430,6 +1734,22 @@ class Session:
                 f"Header part ({value}) from {key} must be of type str or bytes, not {type(value)}"
             )
 
+    @staticmethod
+    def _as_buffer(data: Any) -> Optional[memoryview]:
+        """A memoryview of the bytes of data if it is bytes-like, such as bytes, bytearray,
+        memoryview, array.array or mmap.mmap. Otherwise None."""
+        try:
+            view = memoryview(data)
+        except TypeError:
+            return None
+        if hasattr(view, "cast"):
+            # Measure and slice in bytes rather than in items of the buffer's format.
+            try:
+                return view.cast("B")
+            except TypeError:
+                return None
+        return view
+
     @staticmethod
     def _get_file_length(file_handle: IO):
         is_binary = False
@@ -471,38 +1791,135 @@ class Session:
                 raise OSError(errno.EIO)
             total_sent += sent
 
-    def _send_as_bytes(self, socket: SocketType, data: str):
-        return self._send(socket, bytes(data, "utf-8"))
-
-    def _send_boundary_objects(self, socket: SocketType, boundary_objects: Any):
-        for boundary_object in boundary_objects:
-            if isinstance(boundary_object, str):
-                self._send_as_bytes(socket, boundary_object)
+    def _send_chunks(self, writer: _RequestWriter, chunks: Iterable[Any], framed: bool):
+        """Send each chunk as soon as it is produced, with chunked transfer encoding when
+        framed."""
+        for chunk in chunks:
+            data = bytes(chunk, "utf-8") if isinstance(chunk, str) else chunk
+            if not data:
+                # An empty chunk would end the body.
+                continue
+            body = memoryview(data)
+            if framed:
+                writer.write(bytes(f"{len(body):x}\r\n", "utf-8"))
+                self._send_body(writer, body)
+                writer.write(b"\r\n")
             else:
-                self._send_file(socket, boundary_object)
+                self._send_body(writer, body)
+            writer.flush()
+        if framed:
+            writer.write(b"0\r\n\r\n")
+
+    def _is_iterable_body(self, data: Any) -> bool:
+        """Whether data is a generator or other iterable of chunks, rather than a body that can
+        be sent in one piece."""
+        return (
+            data is not None
+            and not isinstance(data, (str, dict))
+            and not hasattr(data, "read")
+            and hasattr(data, "__iter__")
+            and self._as_buffer(data) is None
+        )
+
+    @staticmethod
+    def _send_body(writer: _RequestWriter, body: memoryview):
+        """Send a bytes-like body in slices of it, so it is never copied."""
+        for start in range(0, len(body), BODY_SLICE_SIZE):
+            writer.write(body[start : start + BODY_SLICE_SIZE])
 
     def _send_file(self, socket: SocketType, file_handle: IO):
-        chunk_size = 36
-        b = bytearray(chunk_size)
-        while True:
-            size = file_handle.readinto(b)
-            if size == 0:
-                break
-            self._send(socket, b[:size])
+        # Let the kernel copy real files to plain sockets on CPython. TLS sockets have a cipher
+        # and need the data encrypted, so they take the buffered path like CircuitPython's.
+        # Wrapped streams, such as gzip files, have a file descriptor but read differently
+        # from what is on disk.
+        if (
+            isinstance(file_handle, _PLAIN_FILES)
+            and hasattr(socket, "sendfile")
+            and not hasattr(socket, "cipher")
+        ):
+            try:
+                file_handle.fileno()
+            except (AttributeError, OSError, ValueError):
+                pass
+            else:
+                socket.sendfile(file_handle)
+                return
+
+        buffer = self._take_upload_buffer()
+        view = memoryview(buffer)
+        try:
+            while True:
+                size = file_handle.readinto(buffer)
+                if not size:
+                    break
+                self._send(socket, view[:size])
+        finally:
+            self._upload_buffer = buffer
+
+    def _take_upload_buffer(self) -> bytearray:
+        # One buffer is allocated the first time it's needed and reused after that. Uploads made
+        # from other threads by Session.map while it is in use get one of their own.
+        with self._lock:
+            buffer = self._upload_buffer
+            self._upload_buffer = None
+        if buffer is None:
+            buffer = bytearray(self._upload_chunk_size)
+        return buffer
+
+    @staticmethod
+    def _iter_json(obj: Any) -> Iterator[str]:
+        """Encode obj as JSON a piece at a time. The pieces join up to ``json.dumps(obj)``."""
+        if isinstance(obj, dict):
+            yield "{"
+            first = True
+            for key, value in obj.items():
+                if not first:
+                    yield ", "
+                first = False
+                # Like json.dumps, keys that aren't strings are written as strings.
+                yield json_module.dumps(key if isinstance(key, str) else json_module.dumps(key))
+                yield ": "
+                yield from Session._iter_json(value)
+            yield "}"
+        elif isinstance(obj, (list, tuple)):
+            yield "["
+            first = True
+            for value in obj:
+                if not first:
+                    yield ", "
+                first = False
+                yield from Session._iter_json(value)
+            yield "]"
+        else:
+            yield json_module.dumps(obj)
+
+    def _send_json(self, writer: _RequestWriter, obj: Any):
+        """Encode obj straight to the socket through the upload buffer, so the whole document
+        is never in memory."""
+        writer.flush()
+        buffer = self._take_upload_buffer()
+        try:
+            body_writer = _RequestWriter(writer.socket, buffer)
+            for piece in self._iter_json(obj):
+                body_writer.write(bytes(piece, "utf-8"))
+            body_writer.flush()
+        finally:
+            self._upload_buffer = buffer
 
-    def _send_header(self, socket, header, value):
+    @staticmethod
+    def _send_header(writer: _RequestWriter, header: str, value: Any):
         if value is None:
             return
-        self._send_as_bytes(socket, header)
-        self._send(socket, b": ")
+        writer.write(bytes(header, "utf-8"))
+        writer.write(b": ")
         if isinstance(value, bytes):
-            self._send(socket, value)
+            writer.write(value)
         else:
-            self._send_as_bytes(socket, value)
-        self._send(socket, b"\r\n")
+            writer.write(bytes(value, "utf-8"))
+        writer.write(b"\r\n")
 
     # noqa: PLR0912 Too many branches
-    def _send_request(  # noqa: PLR0913,PLR0912 Too many arguments in function definition,Too many branches
+    def _send_request(  # noqa: PLR0912,PLR0913,PLR0915 Too many branches,Too many arguments in function definition,Too many statements
         self,
         socket: SocketType,
         host: str,
@@ -512,6 +1929,7 @@ class Session:
         data: Any,
         json: Any,
         files: Optional[Dict[str, tuple]],
+        request_id: Optional[int] = None,
     ):
         # Check headers
         self._check_headers(headers)
@@ -520,11 +1938,15 @@ class Session:
         content_type_header = None
 
         # If json is sent, set content type header and convert to string
+        json_is_streamed = False
         if json is not None:
             assert data is None
             assert files is None
             content_type_header = "application/json"
-            data = json_module.dumps(json)
+            if self._stream_json:
+                json_is_streamed = True
+            else:
+                data = json_module.dumps(json)
 
         # If data is sent and it's a dict, set content type header and convert to string
         if data and isinstance(data, dict):
@@ -543,48 +1965,90 @@ class Session:
         # If files are send, build data to send and calculate length
         content_length = 0
         data_is_file = False
-        boundary_objects = None
+        data_is_iterable = False
         if files and isinstance(files, dict):
-            boundary_string, content_length, boundary_objects = self._build_boundary_data(files)
-            content_type_header = f"multipart/form-data; boundary={boundary_string}"
-        elif data and hasattr(data, "read"):
+            data = MultipartEncoder(files, self._build_boundary_string())
+        if isinstance(data, MultipartEncoder):
+            content_type_header = data.content_type
+            content_length = len(data)
+        elif data and hasattr(data, "read") and self._as_buffer(data) is None:
+            # mmap.mmap has read but is sent from memory like bytes.
             data_is_file = True
             content_length = self._get_file_length(data)
+        elif self._is_iterable_body(data):
+            data_is_iterable = True
+        elif json_is_streamed:
+            # Encode once to find the length without keeping the encoding.
+            for piece in self._iter_json(json):
+                content_length += len(bytes(piece, "utf-8"))
         else:
             if data is None:
                 data = b""
-            content_length = len(data)
+            body = self._as_buffer(data)
+            content_length = len(data) if body is None else len(body)
 
-        self._send_as_bytes(socket, method)
-        self._send(socket, b" /")
-        self._send_as_bytes(socket, path)
-        self._send(socket, b" HTTP/1.1\r\n")
-
-        # create lower-case supplied header list
-        supplied_headers = {header.lower() for header in headers}
-
-        # Send headers
-        if not "host" in supplied_headers:
-            self._send_header(socket, "Host", host)
-        if not "user-agent" in supplied_headers:
-            self._send_header(socket, "User-Agent", "Adafruit CircuitPython")
-        if content_type_header and not "content-type" in supplied_headers:
-            self._send_header(socket, "Content-Type", content_type_header)
-        if (data or files) and not "content-length" in supplied_headers:
-            self._send_header(socket, "Content-Length", str(content_length))
-        for header, value in headers.items():
-            self._send_header(socket, header, value)
-        self._send(socket, b"\r\n")
-
-        # Send data
-        if data_is_file:
-            self._send_file(socket, data)
-        elif data:
-            self._send(socket, bytes(data))
-        elif boundary_objects:
-            self._send_boundary_objects(socket, boundary_objects)
-
-    def request(  # noqa: PLR0912,PLR0913,PLR0915 Too many branches,Too many arguments in function definition,Too many statements
+        # Requests made from other threads by Session.map send unbuffered while the buffer is in
+        # use.
+        request_buffer = self._take_request_buffer()
+        try:
+            writer = _RequestWriter(socket, request_buffer)
+            writer.write(bytes(method, "utf-8"))
+            writer.write(b" /")
+            writer.write(bytes(path, "utf-8"))
+            writer.write(b" HTTP/1.1\r\n")
+
+            # create lower-case supplied header list
+            supplied_headers = {header.lower() for header in headers}
+
+            # Send headers
+            if not "host" in supplied_headers:
+                self._send_header(writer, "Host", host)
+            if not "user-agent" in supplied_headers:
+                self._send_header(writer, "User-Agent", "Adafruit CircuitPython")
+            if self._decompress and not "accept-encoding" in supplied_headers:
+                self._send_header(writer, "Accept-Encoding", ", ".join(DECOMPRESS_ENCODINGS))
+            if content_type_header and not "content-type" in supplied_headers:
+                self._send_header(writer, "Content-Type", content_type_header)
+            # Bodies from iterables are sent in chunks as they are produced, unless their length
+            # was given.
+            framed = data_is_iterable and not "content-length" in supplied_headers
+            if framed and not "transfer-encoding" in supplied_headers:
+                self._send_header(writer, "Transfer-Encoding", "chunked")
+            elif (data or files or json_is_streamed) and not "content-length" in supplied_headers:
+                self._send_header(writer, "Content-Length", str(content_length))
+            for header, value in headers.items():
+                self._send_header(writer, header, value)
+            writer.write(b"\r\n")
+            head_bytes = writer.written
+            if request_id is not None:
+                self._emit("head_sent", request=request_id, bytes=head_bytes)
+
+            # Send data
+            if isinstance(data, MultipartEncoder):
+                data._send(self, writer)
+            elif data_is_file:
+                writer.flush()
+                self._send_file(socket, data)
+            elif data_is_iterable:
+                self._send_chunks(writer, data, framed)
+            elif json_is_streamed:
+                self._send_json(writer, json)
+            elif data:
+                body = self._as_buffer(data)
+                if body is None:
+                    writer.write(bytes(data))
+                else:
+                    self._send_body(writer, body)
+            writer.flush()
+            if request_id is not None:
+                # Files and streamed json are sent around the writer, but their length is known.
+                sent = writer.written - head_bytes if data_is_iterable else content_length
+                self._emit("body_sent", request=request_id, bytes=sent)
+        finally:
+            if request_buffer is not None:
+                self._request_buffer = request_buffer
+
+    def request(  # noqa: PLR0913 Too many arguments in function definition
         self,
         method: str,
         url: str,
@@ -605,6 +2069,79 @@ class Session:
         if not headers:
             headers = {}
 
+        if (
+            self._coalesce
+            and method in ("GET", "HEAD")
+            and not stream
+            and data is None
+            and json is None
+            and files is None
+        ):
+            return self._coalesced_request(method, url, headers, timeout, allow_redirects)
+
+        if (
+            self._cache is not None
+            and method == "GET"
+            and not stream
+            and data is None
+            and json is None
+            and files is None
+        ):
+            return self._cached_request(url, headers, timeout, allow_redirects)
+
+        return self._request(
+            method, url, data, json, headers, stream, timeout, allow_redirects, files
+        )
+
+    def _acquire_lease(
+        self, key: Tuple[str, str, int], limited: bool = True
+    ) -> Tuple[Tuple[str, str, int], int]:
+        """Reserve a connection to key for a new response. Returns the key and the lowest lease
+        number that isn't in use. The open response limits don't apply when not limited."""
+        with self._lock:
+            leases = self._leases.setdefault(key, [])
+            if limited and self._lease_count >= self._max_open_responses:
+                raise RuntimeError(
+                    f"{self._lease_count} responses are already open. Close one before making "
+                    "another request."
+                )
+            if limited and len(leases) >= self._max_open_responses_per_host:
+                raise RuntimeError(
+                    f"{len(leases)} responses from {key[1]}:{key[2]} are already open. Close "
+                    "one before making another request."
+                )
+            # With max_open_responses of 1, requests that aren't leased use the session's own id
+            # and may still be open, so leases start at 1 to never share their socket.
+            number = 0 if self._max_open_responses > 1 else 1
+            while number in leases:
+                number += 1
+            leases.append(number)
+            self._lease_count += 1
+            return key, number
+
+    def _release_lease(self, lease: Tuple[Tuple[str, str, int], int]) -> None:
+        key, number = lease
+        with self._lock:
+            self._leases[key].remove(number)
+            self._lease_count -= 1
+
+    def _take_request_buffer(self) -> Optional[bytearray]:
+        with self._lock:
+            request_buffer = self._request_buffer
+            self._request_buffer = None
+            return request_buffer
+
+    def _lease_session_id(self, number: int) -> Optional[str]:
+        """The connection manager session id for a lease. The connection manager keeps one
+        socket per session id, so each open response gets a socket of its own. Lease 0 uses the
+        session's own id so requests made one at a time share a socket."""
+        if number == 0:
+            return self._session_id
+        return f"{self._session_id}-{number}"
+
+    @staticmethod
+    def _parse_url(url: str) -> Tuple[str, str, int, str]:
+        """Split url into its protocol, host, port and path. The path has no leading slash."""
         try:
             proto, dummy, host, path = url.split("/", 3)
             # replace spaces in path
@@ -622,88 +2159,600 @@ class Session:
         if ":" in host:
             host, port = host.split(":", 1)
             port = int(port)
+        return proto, host, port, path
 
-        if self._last_response:
+    @staticmethod
+    def _redirect_url(url: str, location: str) -> str:
+        """Resolve the Location of a redirect against the url that was requested."""
+        if location.startswith("http"):
+            # absolute URL
+            return location
+        parts = url.split("/", 3)
+        origin = "/".join(parts[:3])
+        if location[0] == "/":
+            # relative URL, absolute path
+            return origin + location
+
+        # relative URL, relative path
+        path = parts[3].rsplit("/", 1)[0] if len(parts) > 3 else ""
+        while location.startswith("../"):
+            path = path.rsplit("/", 1)[0]
+            location = location.split("../", 1)[1]
+        return "/".join([origin, path, location])
+
+    @staticmethod
+    def _cache_expires(headers: Dict[str, str]) -> Optional[float]:
+        """When a response with these headers stops being fresh, or None if it can't be
+        stored."""
+        directives = [
+            directive.strip() for directive in headers.get("cache-control", "").lower().split(",")
+        ]
+        if "no-store" in directives:
+            return None
+        vary = headers.get("vary", "").lower()
+        # Responses are stored by URL alone, so they can't vary on request headers.
+        if vary and any(field.strip() != "accept-encoding" for field in vary.split(",")):
+            return None
+
+        max_age = 0
+        if "no-cache" not in directives:
+            for directive in directives:
+                if directive.startswith("max-age="):
+                    try:
+                        max_age = int(directive[8:]) - int(headers.get("age", 0))
+                    except ValueError:
+                        max_age = 0
+        if max_age <= 0 and "etag" not in headers and "last-modified" not in headers:
+            return None
+        return time.monotonic() + max(max_age, 0)
+
+    def _coalesced_request(
+        self,
+        method: str,
+        url: str,
+        headers: Dict[str, str],
+        timeout: float,
+        allow_redirects: bool,
+    ) -> Response:
+        key = " ".join(
+            [method, url] + sorted(f"{name.lower()}:{value}" for name, value in headers.items())
+        )
+        with self._lock:
+            flight = self._in_flight.get(key)
+            leader = flight is None
+            if leader:
+                flight = _Flight()
+                self._in_flight[key] = flight
+                self._coalesce_misses += 1
+            else:
+                self._coalesce_hits += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return self._replay(flight.data, method)
+
+        try:
+            # Use a socket of its own so requests for other urls can be made at the same time.
+            if self._cache is not None and method == "GET":
+                response = self._cached_request(url, headers, timeout, allow_redirects, True)
+            else:
+                response = self._request(
+                    method, url, None, None, headers, False, timeout, allow_redirects, leased=True
+                )
+            flight.data = response._serialize()
+        except Exception as exc:
+            flight.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+            if flight.done is not None:
+                flight.done.set()
+        return self._replay(flight.data, method)
+
+    def _replay(self, data: bytes, method: str = "GET") -> Response:
+        """A response to method read from buffered data instead of a socket."""
+        return Response(_BufferSocket(data), self, method)
+
+    def _cached_request(
+        self,
+        url: str,
+        headers: Dict[str, str],
+        timeout: float,
+        allow_redirects: bool,
+        leased: bool = False,
+    ) -> Response:
+        entry = self._cache.get(url)
+        if entry is not None:
+            if entry.fresh():
+                return self._replay(entry.data)
+            supplied_headers = {header.lower() for header in headers}
+            headers = headers.copy()
+            if "etag" in entry.headers and "if-none-match" not in supplied_headers:
+                headers["If-None-Match"] = entry.headers["etag"]
+            if "last-modified" in entry.headers and "if-modified-since" not in supplied_headers:
+                headers["If-Modified-Since"] = entry.headers["last-modified"]
+
+        response = self._request(
+            "GET", url, None, None, headers, False, timeout, allow_redirects, leased=leased
+        )
+
+        if entry is not None and response.status_code == 304:
+            response.close()
+            expires = self._cache_expires(response.headers)
+            entry.expires = 0 if expires is None else expires
+            self._cache.set(url, entry)
+            return self._replay(entry.data)
+
+        if response.status_code != 200:
+            return response
+        expires = self._cache_expires(response.headers)
+        if expires is None or int(response.headers.get("content-length", 0)) > self._cache.max_size:
+            self._cache.delete(url)
+            return response
+
+        data = response._serialize()
+        self._cache.set(url, CacheEntry(data, expires))
+        return self._replay(data)
+
+    def _request(  # noqa: PLR0913 Too many arguments in function definition
+        self,
+        method: str,
+        url: str,
+        data: Optional[Any],
+        json: Optional[Any],
+        headers: Dict[str, str],
+        stream: bool,
+        timeout: float,
+        allow_redirects: bool,
+        files: Optional[Dict[str, tuple]] = None,
+        leased: bool = False,
+    ) -> Response:
+        redirects = 0
+        if allow_redirects:
+            redirects, url, (method, data, json, files, headers) = self._remembered_redirects(
+                method, url, data, json, files, headers
+            )
+
+        while True:
+            resp = self._request_once(method, url, data, json, headers, timeout, files, leased)
+            status = resp.status_code
+            if not (
+                allow_redirects
+                and "location" in resp.headers
+                and 300 <= status <= 399
+                and status != 304
+            ):
+                return resp
+            location = self._redirect_url(url, resp.headers["location"])
+            redirected = self._redirect_request(
+                method, url, location, status, data, json, files, headers
+            )
+            # A body that has been used up can't be sent again.
+            resend = data is not None and redirected[1] is data
+            if resend and self._is_iterable_body(data) and iter(data) is data:
+                return resp
+            if redirects >= self._max_redirects:
+                resp.close()
+                raise TooManyRedirects(f"Exceeded {self._max_redirects} redirects")
+            if resp._request_id is not None:
+                self._emit(
+                    "redirect", request=resp._request_id, status_code=status, location=location
+                )
+            resp.close()
+            if status in (301, 308):
+                self._remember_redirect(url, location, status)
+            if resend and hasattr(data, "seek"):
+                data.seek(0)
+            method, data, json, files, headers = redirected
+            url = location
+            redirects += 1
+
+    @staticmethod
+    def _redirect_request(  # noqa: PLR0913 Too many arguments in function definition
+        method: str,
+        url: str,
+        location: str,
+        status: int,
+        data: Optional[Any],
+        json: Optional[Any],
+        files: Optional[Dict[str, tuple]],
+        headers: Dict[str, str],
+    ) -> Tuple[str, Optional[Any], Optional[Any], Optional[Dict[str, tuple]], Dict[str, str]]:
+        """The method, body and headers to follow a redirect from url to location with. A 303 is
+        followed with a GET, as are 301 and 302 redirects of a POST. 307 and 308 keep the method
+        and body. Authorization is not sent to another host."""
+        if (status == 303 and method != "HEAD") or (status in (301, 302) and method == "POST"):
+            method = "GET"
+            data = json = files = None
+            headers = {
+                name: value
+                for name, value in headers.items()
+                if name.lower() not in ("content-type", "content-length", "transfer-encoding")
+            }
+        if url.split("/", 3)[:3] != location.split("/", 3)[:3]:
+            headers = {
+                name: value for name, value in headers.items() if name.lower() != "authorization"
+            }
+        return method, data, json, files, headers
+
+    def _remembered_redirects(  # noqa: PLR0913 Too many arguments in function definition
+        self,
+        method: str,
+        url: str,
+        data: Optional[Any],
+        json: Optional[Any],
+        files: Optional[Dict[str, tuple]],
+        headers: Dict[str, str],
+    ) -> Tuple[int, str, tuple]:
+        """Follow the permanent redirects remembered for url without making any requests.
+        Returns how many were followed, the final url and what `_redirect_request` returned."""
+        redirects = 0
+        with self._lock:
+            while url in self._redirects and redirects < self._max_redirects:
+                location, status = self._redirects.pop(url)
+                # Move it to the most recently used end.
+                self._redirects[url] = (location, status)
+                method, data, json, files, headers = self._redirect_request(
+                    method, url, location, status, data, json, files, headers
+                )
+                url = location
+                redirects += 1
+        return redirects, url, (method, data, json, files, headers)
+
+    def _remember_redirect(self, url: str, location: str, status: int) -> None:
+        """Store a permanent redirect so later requests for url skip it."""
+        if not self._redirect_cache_size:
+            return
+        with self._lock:
+            self._redirects.pop(url, None)
+            self._redirects[url] = (location, status)
+            while len(self._redirects) > self._redirect_cache_size:
+                del self._redirects[next(iter(self._redirects))]
+
+    def _request_once(  # noqa: PLR0912,PLR0913,PLR0915 Too many branches,Too many arguments in function definition,Too many statements
+        self,
+        method: str,
+        url: str,
+        data: Optional[Any],
+        json: Optional[Any],
+        headers: Dict[str, str],
+        timeout: float,
+        files: Optional[Dict[str, tuple]],
+        leased: bool,
+    ) -> Response:
+        proto, host, port, path = self._parse_url(url)
+
+        lease = None
+        session_id = self._session_id
+        if leased or self._max_open_responses > 1:
+            lease = self._acquire_lease((proto, host, port), limited=not leased)
+            session_id = self._lease_session_id(lease[1])
+        elif self._last_response:
             self._last_response.close()
             self._last_response = None
 
-        # We may fail to send the request if the socket we got is closed already. So, try a second
-        # time in that case.
-        # Note that the loop below actually tries a second time in other failure cases too,
-        # namely timeout and no data from socket. This was not covered in the stated intent of the
-        # commit that introduced the loop, but removing the retry from those cases could prove
-        # problematic to callers that now depend on that resiliency.
-        retry_count = 0
-        last_exc = None
-        while retry_count < 2:
-            retry_count += 1
-            socket = self._connection_manager.get_socket(
-                host,
-                port,
-                proto,
-                session_id=self._session_id,
-                timeout=timeout,
-                ssl_context=self._ssl_context,
-            )
-            ok = True
-            try:
-                self._send_request(socket, host, method, path, headers, data, json, files)
-            except OSError as exc:
-                last_exc = exc
-                ok = False
-            if ok:
-                # Read the H of "HTTP/1.1" to make sure the socket is alive. send can appear to work
-                # even when the socket is closed.
-                # Both recv/recv_into can raise OSError; when that happens, we need to call
-                # _connection_manager.close_socket(socket) or future calls to
-                # _connection_manager.get_socket() for the same parameter set will fail
+        # We may fail to send the request if the socket we got is closed already. So, by default,
+        # try a second time in that case.
+        # Note that the default also tries a second time in other failure cases, namely timeout
+        # and no data from socket. This was not covered in the stated intent of the commit that
+        # introduced the retry, but removing the retry from those cases could prove problematic
+        # to callers that now depend on that resiliency.
+        # A generator body is used up by the first attempt, so it can't be retried.
+        retry = self._retry
+        replayable = not (self._is_iterable_body(data) and iter(data) is data)
+        can_retry = replayable and retry.allows(method)
+        request_id = self._next_request_id() if self._listeners else None
+        attempt = 0
+        delay = 0
+        try:
+            while True:
+                attempt += 1
+                if attempt > 1:
+                    if request_id is not None:
+                        self._emit(
+                            "retry", request=request_id, attempt=attempt, phase=phase, error=error
+                        )
+                    if delay > 0:
+                        time.sleep(delay)
+                socket = None
+                error = None
+                phase = "connect"
                 try:
+                    socket = self._connect(host, port, proto, session_id, timeout, request_id)
+                    phase = "send"
+                    self._send_request(
+                        socket, host, method, path, headers, data, json, files, request_id
+                    )
+                    phase = "first_byte"
+                    # Read the H of "HTTP/1.1" to make sure the socket is alive. send can appear
+                    # to work even when the socket is closed.
                     if hasattr(socket, "recv"):
                         result = socket.recv(1)
                     else:
                         result = bytearray(1)
                         socket.recv_into(result)
-                    if result == b"H":
-                        # Things seem to be ok so break with socket set.
-                        break
-                    else:
+                    if result != b"H":
                         raise RuntimeError("no data from socket")
-                except (OSError, RuntimeError) as exc:
-                    last_exc = exc
-                    pass
-            self._connection_manager.close_socket(socket)
-            socket = None
-
-        if not socket:
-            raise OutOfRetries("Repeated socket failures") from last_exc
-
-        resp = Response(socket, self, method)  # our response
-        if allow_redirects:
-            if "location" in resp.headers and 300 <= resp.status_code <= 399:
-                # a naive handler for redirects
-                redirect = resp.headers["location"]
-
-                if redirect.startswith("http"):
-                    # absolute URL
-                    url = redirect
-                elif redirect[0] == "/":
-                    # relative URL, absolute path
-                    url = "/".join([proto, dummy, host, redirect[1:]])
-                else:
-                    # relative URL, relative path
-                    path = path.rsplit("/", 1)[0]
-
-                    while redirect.startswith("../"):
-                        path = path.rsplit("/", 1)[0]
-                        redirect = redirect.split("../", 1)[1]
+                except OSError as exc:
+                    error = exc
+                except RuntimeError as exc:
+                    if phase != "first_byte":
+                        raise
+                    error = exc
+
+                if error is not None:
+                    # Both recv/recv_into can raise OSError; when that happens, we need to call
+                    # _connection_manager.close_socket(socket) or future calls to
+                    # _connection_manager.get_socket() for the same parameter set will fail
+                    if socket is not None:
+                        self._connection_manager.close_socket(socket)
+                    if can_retry and attempt < retry.total and phase in retry.phases:
+                        delay = retry.delay(attempt)
+                        continue
+                    if phase == "connect":
+                        raise error
+                    raise OutOfRetries("Repeated socket failures") from error
+
+                if request_id is not None:
+                    self._emit("first_byte", request=request_id)
+                resp = Response(socket, self, method)  # our response
+                if (
+                    can_retry
+                    and attempt < retry.total
+                    and resp.status_code in retry.status_forcelist
+                ):
+                    phase = "status"
+                    delay = retry.delay(attempt, resp.headers.get("retry-after"))
+                    if request_id is not None:
+                        resp._request_id = request_id
+                        self._emit(
+                            "headers_parsed", request=request_id, status_code=resp.status_code
+                        )
+                    # The response doesn't have the lease, so closing it keeps it for the retry.
+                    resp.close()
+                    continue
+                break
+        except BaseException as exc:
+            if lease is not None:
+                self._release_lease(lease)
+            if request_id is not None:
+                self._emit("failed", request=request_id, error=exc)
+            raise
+
+        resp._lease = lease
+        if lease is None:
+            self._last_response = resp
+        if request_id is not None:
+            resp._request_id = request_id
+            self._emit("headers_parsed", request=request_id, status_code=resp.status_code)
+            if resp._remaining == 0 and not resp._chunked:
+                resp._body_complete()
+        return resp
 
-                    url = "/".join([proto, dummy, host, path, redirect])
+    def _connect(  # noqa: PLR0913 Too many arguments in function definition
+        self,
+        host: str,
+        port: int,
+        proto: str,
+        session_id: Optional[str],
+        timeout: float,
+        request_id: Optional[int],
+    ) -> SocketType:
+        if request_id is None:
+            return self._connection_manager.get_socket(
+                host,
+                port,
+                proto,
+                session_id=session_id,
+                timeout=timeout,
+                ssl_context=self._ssl_context,
+            )
+        self._emit("connect_start", request=request_id, host=host, port=port, proto=proto)
+        managed = self._managed_socket_count()
+        socket = self._connection_manager.get_socket(
+            host,
+            port,
+            proto,
+            session_id=session_id,
+            timeout=timeout,
+            ssl_context=self._ssl_context,
+        )
+        reused = managed is not None and self._managed_socket_count() == managed
+        self._emit(
+            "connect_end", request=request_id, host=host, port=port, proto=proto, reused=reused
+        )
+        return socket
+
+    def _managed_socket_count(self) -> Optional[int]:
+        """How many sockets the connection manager has open, if it says."""
+        return getattr(self._connection_manager, "managed_socket_count", None)
+
+    def pipeline(
+        self,
+        urls: Sequence[str],
+        method: str = "GET",
+        headers: Optional[Dict[str, str]] = None,
+        timeout: float = 60,
+    ) -> List[Response]:
+        """Send several GET or HEAD requests to one host back-to-back on one connection and
+        return their responses in the same order. Over a slow link this takes about one round
+        trip instead of one per request.
+
+        The responses have their content buffered. If the server answers with
+        ``Connection: close`` or the connection fails, the remaining requests are made one at
+        a time. Redirects aren't followed.
+        """
+        if method not in ("GET", "HEAD"):
+            raise ValueError("Only GET and HEAD requests can be pipelined")
+        if not headers:
+            headers = {}
+        parsed = [self._parse_url(url) for url in urls]
+        if not parsed:
+            return []
+        proto, host, port, _ = parsed[0]
+        for other in parsed:
+            if other[:3] != (proto, host, port):
+                raise ValueError("Pipelined requests must all be to the same host and port")
 
-                self._last_response = resp
-                resp = self.request(method, url, data, json, headers, stream, timeout)
+        if self._last_response:
+            self._last_response.close()
+            self._last_response = None
 
-        self._last_response = resp
-        return resp
+        lease = None
+        session_id = self._session_id
+        if self._max_open_responses > 1:
+            lease = self._acquire_lease((proto, host, port))
+            session_id = self._lease_session_id(lease[1])
+        responses = []
+        try:
+            socket = self._connection_manager.get_socket(
+                host,
+                port,
+                proto,
+                session_id=session_id,
+                timeout=timeout,
+                ssl_context=self._ssl_context,
+            )
+            responses = self._read_pipeline(socket, parsed, method, headers)
+        except OSError:
+            pass
+        finally:
+            if lease is not None:
+                self._release_lease(lease)
+
+        # Make whatever is left one request at a time.
+        for url in urls[len(responses) :]:
+            response = self._request(method, url, None, None, headers, False, timeout, False)
+            responses.append(self._replay(response._serialize(), response._method))
+        return responses
+
+    def _read_pipeline(
+        self,
+        socket: SocketType,
+        requests: List[Tuple[str, str, int, str]],
+        method: str,
+        headers: Dict[str, str],
+    ) -> List[Response]:
+        """Send the requests on socket and read as many responses as the server gives before
+        closing the connection. The socket is freed or closed."""
+        responses = []
+        reusable = False
+        try:
+            for _, host, _, path in requests:
+                self._send_request(socket, host, method, path, headers, None, None, None)
+
+            leftover = b""
+            for _ in requests:
+                # The end of one response may have been received with the previous one.
+                response = Response(_PrefixedSocket(leftover, socket), self, method)
+                response._cached = response._read_all()
+                leftover = bytes(
+                    response._receive_buffer[response._receive_start : response._receive_end]
+                )
+                responses.append(self._replay(response._serialize(), response._method))
+                if response.headers.get("connection", "").lower() == "close":
+                    break
+            else:
+                reusable = not leftover
+        except (OSError, RuntimeError):
+            pass
+        if reusable:
+            self._connection_manager.free_socket(socket)
+        else:
+            self._connection_manager.close_socket(socket)
+        return responses
+
+    def _map_request(self, request: Union[str, Dict[str, Any]], timeout: float) -> Response:
+        """Make one of the requests of `map` or `as_completed` and buffer its response."""
+        if isinstance(request, str):
+            request = {"url": request}
+        response = self._request(
+            request.get("method", "GET"),
+            request["url"],
+            request.get("data"),
+            request.get("json"),
+            request.get("headers") or {},
+            False,
+            request.get("timeout", timeout),
+            request.get("allow_redirects", True),
+            request.get("files"),
+            leased=True,
+        )
+        return self._replay(response._serialize(), response._method)
+
+    def _submit(
+        self,
+        executor: Any,
+        requests: Iterable[Union[str, Dict[str, Any]]],
+        timeout: float,
+    ) -> List[Any]:
+        self._make_thread_safe()
+        return [executor.submit(self._map_request, request, timeout) for request in requests]
+
+    def map(
+        self,
+        requests: Iterable[Union[str, Dict[str, Any]]],
+        max_workers: int = 4,
+        timeout: float = 60,
+        fail_fast: bool = False,
+    ) -> List[Union[Response, Exception]]:
+        """Make several requests in parallel from a pool of threads and return their responses
+        in the same order. Not available on CircuitPython, which has no threads.
+
+        Each request is a url to GET or a dictionary of `request` arguments, such as
+        ``{"method": "POST", "url": url, "json": data, "timeout": 5}``. Every worker uses its
+        own socket, so up to ``max_workers`` sockets are open at once. The responses have
+        their content buffered and don't count towards ``max_open_responses``. ``timeout`` is
+        used for requests that don't give their own.
+
+        A request that fails has its exception in place of a response. With ``fail_fast``,
+        the first failure is raised instead and the requests that haven't started are
+        cancelled.
+        """
+        if futures is None:
+            raise NotImplementedError("Session.map requires threads")
+        with futures.ThreadPoolExecutor(max_workers) as executor:
+            pending = self._submit(executor, requests, timeout)
+            if fail_fast:
+                done, _ = futures.wait(pending, return_when=futures.FIRST_EXCEPTION)
+                for future in done:
+                    if future.exception() is not None:
+                        for other in pending:
+                            other.cancel()
+                        raise future.exception()
+            results = []
+            for future in pending:
+                exc = future.exception()
+                results.append(future.result() if exc is None else exc)
+            return results
+
+    def as_completed(
+        self,
+        requests: Iterable[Union[str, Dict[str, Any]]],
+        max_workers: int = 4,
+        timeout: float = 60,
+        fail_fast: bool = False,
+    ) -> Iterator[Tuple[int, Union[Response, Exception]]]:
+        """Like `map`, but yields ``(index, response)`` pairs as the requests complete. The
+        index is the request's position in ``requests``."""
+        if futures is None:
+            raise NotImplementedError("Session.as_completed requires threads")
+        with futures.ThreadPoolExecutor(max_workers) as executor:
+            pending = self._submit(executor, requests, timeout)
+            indices = {future: index for index, future in enumerate(pending)}
+            try:
+                for future in futures.as_completed(pending):
+                    exc = future.exception()
+                    if exc is not None and fail_fast:
+                        raise exc
+                    yield indices[future], future.result() if exc is None else exc
+            finally:
+                # Stop early if the caller did, or on a failure.
+                for future in pending:
+                    future.cancel()
 
     def options(self, url: str, **kw) -> Response:
         """Send HTTP OPTIONS request"""
@@ -732,3 +2781,537 @@ class Session:
     def delete(self, url: str, **kw) -> Response:
         """Send HTTP DELETE request"""
         return self.request("DELETE", url, **kw)
+
+
+class _CollectingSocket:
+    """Collects everything sent to it, so a request can be serialized before it is sent."""
+
+    def __init__(self) -> None:
+        self.data = bytearray()
+
+    def send(self, data: bytes) -> int:
+        """Append data to what has been collected."""
+        self.data.extend(data)
+        return len(data)
+
+
+class _StreamConnection:
+    """A connection made with asyncio streams, used with CPython's socket module."""
+
+    def __init__(self, reader: Any, writer: Any, timeout: float) -> None:
+        self._reader = reader
+        self._writer = writer
+        self.timeout = timeout
+
+    async def send(self, data: bytes) -> None:
+        """Send all of data."""
+        self._writer.write(data)
+        await asyncio.wait_for(self._writer.drain(), self.timeout)
+
+    async def recv_into(self, buf: WriteableBuffer) -> int:
+        """Receive as many bytes as are available into buf. Returns 0 at the end of the stream."""
+        data = await asyncio.wait_for(self._reader.read(len(buf)), self.timeout)
+        buf[: len(data)] = data
+        return len(data)
+
+    def close(self) -> None:
+        """Close the connection."""
+        self._writer.close()
+
+
+class _PollingConnection:
+    """A socket from the connection manager that is polled without blocking. The event loop
+    runs other tasks while the socket isn't ready."""
+
+    def __init__(self, session: Session, sock: SocketType, timeout: float) -> None:
+        self._session = session
+        self.socket = sock
+        self.timeout = timeout
+        sock.settimeout(0)
+
+    async def _wait(self, start: float) -> None:
+        if self.timeout is not None and time.monotonic() - start > self.timeout:
+            raise OSError(errno.ETIMEDOUT)
+        await asyncio.sleep(0)
+
+    async def send(self, data: bytes) -> None:
+        """Send all of data."""
+        data = memoryview(data)
+        start = time.monotonic()
+        total_sent = 0
+        while total_sent < len(data):
+            try:
+                sent = self.socket.send(data[total_sent:])
+            except OSError as exc:
+                if exc.errno != errno.EAGAIN:
+                    raise
+                await self._wait(start)
+                continue
+            if sent is None:
+                sent = len(data) - total_sent
+            if sent == 0:
+                raise OSError(errno.EIO)
+            total_sent += sent
+
+    async def recv_into(self, buf: WriteableBuffer) -> int:
+        """Receive as many bytes as are available into buf. Returns 0 at the end of the stream."""
+        start = time.monotonic()
+        while True:
+            try:
+                return self.socket.recv_into(buf)
+            except OSError as exc:
+                if exc.errno not in (errno.EAGAIN, errno.ETIMEDOUT):
+                    raise
+            await self._wait(start)
+
+    def close(self) -> None:
+        """Close the socket."""
+        self._session._connection_manager.close_socket(self.socket)
+
+
+class _AsyncContentIterator:
+    """Iterates over the content of an `AsyncResponse` with ``async for``."""
+
+    def __init__(self, response: "AsyncResponse", chunk_size: int) -> None:
+        self._response = response
+        self._buffer = bytearray(chunk_size)
+
+    def __aiter__(self) -> "_AsyncContentIterator":
+        return self
+
+    async def __anext__(self) -> bytes:
+        size = await self._response._readinto(self._buffer)
+        if size == 0:
+            self._response.close()
+            raise StopAsyncIteration
+        return bytes(memoryview(self._buffer)[:size])
+
+
+class AsyncResponse:
+    """The response from an `AsyncSession` request. The status and headers are available as
+    soon as the request returns. The content is read with ``await``.
+
+    Unless the request was made with ``stream=True`` the content has already been read and
+    the connection returned to the session.
+    """
+
+    encoding = None
+
+    def __init__(self, connection: Any, session: "AsyncSession", key: tuple, method: str) -> None:
+        self._connection = connection
+        self._session = session
+        self._key = key
+        self._method = method
+        self.encoding = "utf-8"
+        self.status_code: int = 0
+        """The status code returned by the server"""
+        self.reason: bytearray = bytearray()
+        """The status reason returned by the server"""
+        self._headers = {}
+        self._remaining = None
+        self._chunked = False
+        self._content = None
+        # Bytes that were received but not consumed yet.
+        self._pending = b""
+        self._line_buffer = None
+
+    async def __aenter__(self) -> "AsyncResponse":
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[type]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    async def _read_head(self) -> bool:
+        """Receive the status line and headers and parse them. Returns False if the connection
+        was closed before anything was received."""
+        limit = self._session._session._max_receive_buffer_size
+        head = bytearray()
+        buf = bytearray(CONTENT_CHUNK_SIZE)
+        while True:
+            read = await self._connection.recv_into(buf)
+            if read == 0:
+                break
+            search_start = max(0, len(head) - 3)
+            head.extend(memoryview(buf)[:read])
+            end = head.find(b"\r\n\r\n", search_start)
+            if end >= 0:
+                self._pending = bytes(head[end + 4 :])
+                head = head[: end + 4]
+                break
+            if len(head) > limit:
+                raise RuntimeError(
+                    f"Response headers are larger than max_receive_buffer_size ({limit} bytes)"
+                )
+        if not head:
+            return False
+
+        # Parse with a regular Response so both handle headers the same way.
+        parsed = Response(_BufferSocket(bytes(head)), self._session._session, self._method)
+        self.status_code = parsed.status_code
+        self.reason = parsed.reason
+        self._headers = parsed._headers
+        self._remaining = parsed._remaining
+        self._chunked = parsed._chunked
+        return True
+
+    async def _recv_into(self, buf: WriteableBuffer) -> int:
+        if self._pending:
+            read = min(len(buf), len(self._pending))
+            buf[:read] = self._pending[:read]
+            self._pending = self._pending[read:]
+            return read
+        return await self._connection.recv_into(buf)
+
+    async def _readline(self) -> bytes:
+        limit = self._session._session._max_receive_buffer_size
+        while True:
+            i = self._pending.find(b"\r\n")
+            if i >= 0:
+                line = self._pending[:i]
+                self._pending = self._pending[i + 2 :]
+                return line
+            if len(self._pending) > limit:
+                raise RuntimeError(
+                    f"Response line is larger than max_receive_buffer_size ({limit} bytes)"
+                )
+            if self._line_buffer is None:
+                self._line_buffer = bytearray(64)
+            read = await self._connection.recv_into(self._line_buffer)
+            if read == 0:
+                line = self._pending
+                self._pending = b""
+                return line
+            self._pending += bytes(memoryview(self._line_buffer)[:read])
+
+    async def _readinto(self, buf: WriteableBuffer) -> int:
+        if not self._connection:
+            raise RuntimeError("Response closed. Read the content before closing it.")
+
+        if not self._remaining:
+            if self._chunked:
+                # Consume trailing \r\n for chunks 2+
+                if self._remaining == 0:
+                    await self._readline()
+                chunk_header = (await self._readline()).split(b";", 1)[0]
+                http_chunk_size = int(chunk_header, 16)
+                if http_chunk_size == 0:
+                    self._chunked = False
+                    self._remaining = 0
+                    # Add any headers from the trailer.
+                    line = await self._readline()
+                    while line:
+                        title, content = line.split(b":", 1)
+                        self._headers[str(title.strip(), "utf-8").lower()] = str(
+                            content.strip(), "utf-8"
+                        )
+                        line = await self._readline()
+                    return 0
+                self._remaining = http_chunk_size
+            elif self._remaining is not None:
+                return 0
+
+        nbytes = len(buf)
+        if self._remaining is not None:
+            nbytes = min(nbytes, self._remaining)
+        read = await self._recv_into(memoryview(buf)[:nbytes])
+        if self._remaining is not None:
+            self._remaining -= read
+        return read
+
+    async def readinto(self, buf: WriteableBuffer) -> int:
+        """Read content into buf until it is full or the content ends. Returns the number of
+        bytes read."""
+        buf = memoryview(buf)
+        end = 0
+        while end < len(buf):
+            read = await self._readinto(buf[end:])
+            if read == 0:
+                break
+            end += read
+        return end
+
+    def close(self) -> None:
+        """Return the connection to the session if the content has been read, otherwise close
+        it."""
+        if not self._connection:
+            return
+        if (
+            self._chunked
+            or self._remaining != 0
+            or self._pending
+            or self._headers.get("connection", "").lower() == "close"
+        ):
+            self._connection.close()
+        else:
+            self._session._release(self._key, self._connection)
+        self._connection = None
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        """
+        The response headers. Does not include headers from the trailer until
+        the content has been read.
+        """
+        return self._headers
+
+    async def content(self) -> bytes:
+        """The HTTP content direct from the socket, as bytes"""
+        if self._content is not None:
+            return self._content
+
+        if self._remaining is not None and not self._chunked:
+            # The length is known so read straight into a buffer of that size.
+            buf = bytearray(self._remaining)
+            end = await self.readinto(buf)
+            content = bytes(memoryview(buf)[:end]) if end < len(buf) else bytes(buf)
+        else:
+            result = bytearray()
+            chunk = bytearray(CONTENT_CHUNK_SIZE)
+            while True:
+                read = await self._readinto(chunk)
+                if read == 0:
+                    break
+                result.extend(memoryview(chunk)[:read])
+            content = bytes(result)
+        self._content = content
+        self.close()
+        return content
+
+    async def text(self) -> str:
+        """The HTTP content, encoded into a string according to the HTTP
+        header encoding"""
+        self._validate_not_gzip()
+        return str(await self.content(), self.encoding)
+
+    async def json(self) -> Any:
+        """The HTTP content, parsed into a json dictionary"""
+        self._validate_not_gzip()
+        return json_module.loads(await self.text())
+
+    def _validate_not_gzip(self) -> None:
+        if self.headers.get("content-encoding") == "gzip":
+            raise ValueError(
+                "Content-encoding is gzip, data cannot be accessed as json or text. "
+                "Use content() to access raw bytes."
+            )
+
+    def iter_content(self, chunk_size: int = 1, decode_unicode: bool = False) -> Any:
+        """An asynchronous iterator that streams the content, for use with ``async for``.
+        Each chunk is at most 'chunk_size' bytes."""
+        if decode_unicode:
+            raise NotImplementedError("Unicode not supported")
+        return _AsyncContentIterator(self, chunk_size)
+
+
+class AsyncSession:
+    """HTTP session for use with ``asyncio``. Requests made from different tasks run
+    concurrently, each on its own connection. Connections are kept open and reused by later
+    requests to the same host.
+
+    When ``socket_pool`` is CPython's ``socket`` module, connections are made with asyncio
+    streams. Sockets from other pools, such as CircuitPython's ``socketpool``, are connected by
+    the connection manager and polled without blocking, so other tasks run while they wait.
+
+    .. code-block:: python
+
+        session = adafruit_requests.AsyncSession(pool, ssl_context)
+        responses = await asyncio.gather(
+            session.get("https://example.com/a"), session.get("https://example.com/b")
+        )
+        data = [await response.json() for response in responses]
+
+    :param int receive_buffer_size: The initial size of the buffer used to parse headers.
+    :param int max_receive_buffer_size: The largest the response headers may be. Larger
+      headers raise a `RuntimeError`.
+    :param int max_redirects: How many redirects a request follows before raising
+      `TooManyRedirects`.
+    """
+
+    def __init__(  # noqa: PLR0913 Too many arguments in function definition
+        self,
+        socket_pool: SocketpoolModuleType,
+        ssl_context: Optional[SSLContextType] = None,
+        session_id: Optional[str] = None,
+        receive_buffer_size: int = 32,
+        max_receive_buffer_size: int = 16384,
+        max_redirects: int = 30,
+    ) -> None:
+        if asyncio is None:
+            raise RuntimeError("AsyncSession requires asyncio")
+        # Requests are serialized and headers parsed by a regular session.
+        self._session = Session(
+            socket_pool,
+            ssl_context,
+            session_id,
+            receive_buffer_size=receive_buffer_size,
+            max_receive_buffer_size=max_receive_buffer_size,
+            max_redirects=max_redirects,
+        )
+        self._streams = (
+            sys.implementation.name == "cpython"
+            and getattr(socket_pool, "__name__", None) == "socket"
+        )
+        self._idle = {}
+        self._connection_count = 0
+
+    async def _connect(self, key: tuple, timeout: float) -> Tuple[Any, bool]:
+        """Returns an idle connection for key, or a new one, and whether it was reused."""
+        idle = self._idle.get(key)
+        if idle:
+            connection = idle.pop()
+            connection.timeout = timeout
+            return connection, True
+
+        proto, host, port = key
+        if self._streams:
+            ssl = None
+            if proto == "https:":
+                ssl = self._session._ssl_context or True
+            reader, writer = await asyncio.wait_for(
+                asyncio.open_connection(host, port, ssl=ssl), timeout
+            )
+            return _StreamConnection(reader, writer, timeout), False
+
+        # Every connection needs its own session id so the connection manager doesn't hand out
+        # a socket that another task is using.
+        self._connection_count += 1
+        session_id = f"async-{self._connection_count}"
+        if self._session._session_id is not None:
+            session_id = f"{self._session._session_id}-{session_id}"
+        sock = self._session._connection_manager.get_socket(
+            host,
+            port,
+            proto,
+            session_id=session_id,
+            timeout=timeout,
+            ssl_context=self._session._ssl_context,
+        )
+        return _PollingConnection(self._session, sock, timeout), False
+
+    def _release(self, key: tuple, connection: Any) -> None:
+        self._idle.setdefault(key, []).append(connection)
+
+    def close(self) -> None:
+        """Close the idle connections."""
+        for connections in self._idle.values():
+            for connection in connections:
+                connection.close()
+        self._idle = {}
+
+    async def request(  # noqa: PLR0913 Too many arguments in function definition
+        self,
+        method: str,
+        url: str,
+        data: Optional[Any] = None,
+        json: Optional[Any] = None,
+        headers: Optional[Dict[str, str]] = None,
+        stream: bool = False,
+        timeout: float = 60,
+        allow_redirects: bool = True,
+        files: Optional[Dict[str, tuple]] = None,
+    ) -> AsyncResponse:
+        """Perform an HTTP request to the given url. Takes the same arguments as
+        `Session.request`. Unless 'stream' is True, the content is read before returning."""
+        if not headers:
+            headers = {}
+
+        session = self._session
+        redirects = 0
+        if allow_redirects:
+            redirects, url, (method, data, json, files, headers) = session._remembered_redirects(
+                method, url, data, json, files, headers
+            )
+        while True:
+            response = await self._request_once(method, url, data, json, headers, timeout, files)
+            status = response.status_code
+            if not (
+                allow_redirects
+                and "location" in response.headers
+                and 300 <= status <= 399
+                and status != 304
+            ):
+                break
+            if redirects >= session._max_redirects:
+                response.close()
+                raise TooManyRedirects(f"Exceeded {session._max_redirects} redirects")
+            response.close()
+            location = Session._redirect_url(url, response.headers["location"])
+            if status in (301, 308):
+                session._remember_redirect(url, location, status)
+            method, data, json, files, headers = Session._redirect_request(
+                method, url, location, status, data, json, files, headers
+            )
+            url = location
+            redirects += 1
+
+        if not stream:
+            await response.content()
+        return response
+
+    async def _request_once(  # noqa: PLR0913 Too many arguments in function definition
+        self,
+        method: str,
+        url: str,
+        data: Optional[Any],
+        json: Optional[Any],
+        headers: Dict[str, str],
+        timeout: float,
+        files: Optional[Dict[str, tuple]],
+    ) -> AsyncResponse:
+        proto, host, port, path = Session._parse_url(url)
+        request = _CollectingSocket()
+        self._session._send_request(request, host, method, path, headers, data, json, files)
+
+        key = (proto, host, port)
+        while True:
+            connection, reused = await self._connect(key, timeout)
+            response = AsyncResponse(connection, self, key, method)
+            try:
+                await connection.send(request.data)
+                if await response._read_head():
+                    return response
+            except OSError:
+                connection.close()
+                if not reused:
+                    raise
+                continue
+            except BaseException:
+                connection.close()
+                raise
+            # An idle connection may have been closed by the server, so try the next one.
+            connection.close()
+            if not reused:
+                raise RuntimeError("Unable to read HTTP response.")
+
+    async def options(self, url: str, **kw) -> AsyncResponse:
+        """Send HTTP OPTIONS request"""
+        return await self.request("OPTIONS", url, **kw)
+
+    async def head(self, url: str, **kw) -> AsyncResponse:
+        """Send HTTP HEAD request"""
+        return await self.request("HEAD", url, **kw)
+
+    async def get(self, url: str, **kw) -> AsyncResponse:
+        """Send HTTP GET request"""
+        return await self.request("GET", url, **kw)
+
+    async def post(self, url: str, **kw) -> AsyncResponse:
+        """Send HTTP POST request"""
+        return await self.request("POST", url, **kw)
+
+    async def put(self, url: str, **kw) -> AsyncResponse:
+        """Send HTTP PUT request"""
+        return await self.request("PUT", url, **kw)
+
+    async def patch(self, url: str, **kw) -> AsyncResponse:
+        """Send HTTP PATCH request"""
+        return await self.request("PATCH", url, **kw)
+
+    async def delete(self, url: str, **kw) -> AsyncResponse:
+        """Send HTTP DELETE request"""
+        return await self.request("DELETE", url, **kw)
@@ -0,0 +1,135 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: Unlicense
+
+"""Header parsing benchmark.
+
+Parses responses with many headers, comparing the read cursor used by `Response._readto` with
+the previous approach of shifting the buffer after every line. The whole header block is received
+into the buffer at once, so the old parser moves the rest of the block after each line and its
+cost grows with the square of the number of headers. Run it directly::
+
+    python benchmarks/bench_headers.py
+
+or with pytest-benchmark::
+
+    pytest benchmarks/bench_headers.py
+"""
+
+import timeit
+
+from memsocket import MemoryPool, MemorySocket
+
+import adafruit_requests
+
+HEADER_COUNTS = (10, 50, 100, 200, 400)
+BUFFER_SIZE = 65536
+
+
+class MemmoveResponse(adafruit_requests.Response):
+    """`Response` with the header parsing used before the read cursor was added. Counts the
+    bytes it moves in `bytes_moved`."""
+
+    bytes_moved = 0
+
+    def _readto(self, stop: bytes) -> bytearray:
+        buf = self._receive_buffer
+        end = self._receive_end
+        while True:
+            i = buf.find(stop, 0, end)
+            if i >= 0:
+                result = buf[:i]
+                new_start = i + len(stop)
+                new_end = end - new_start
+                buf[:new_end] = buf[new_start:end]
+                MemmoveResponse.bytes_moved += new_end
+                self._receive_end = new_end
+                return result
+            if end == len(buf):
+                buf = self._grow_receive_buffer()
+            read = self._recv_into(memoryview(buf)[end:])
+            if read == 0:
+                self._receive_end = 0
+                return buf[:end]
+            end += read
+            self._receive_end = end
+
+
+def build_response(header_count: int) -> bytes:
+    """A response with ``header_count`` realistic looking headers and an empty body."""
+    lines = [b"HTTP/1.1 200 OK"]
+    for i in range(header_count):
+        lines.append(b"X-Header-%d: %s" % (i, b"v" * (60 + i % 80)))
+    lines.append(b"Content-Length: 0")
+    return b"\r\n".join(lines) + b"\r\n\r\n"
+
+
+SESSION = adafruit_requests.Session(
+    MemoryPool(), receive_buffer_size=BUFFER_SIZE, max_receive_buffer_size=BUFFER_SIZE
+)
+SOCKET = MemorySocket(max_recv=BUFFER_SIZE)
+
+
+def parse(response: bytes, response_class: type = adafruit_requests.Response):
+    """Parse the status line and headers of ``response``."""
+    SOCKET.reset(response)
+    return response_class(SOCKET, SESSION, "GET")
+
+
+def test_parse_headers_50(benchmark):
+    benchmark(parse, build_response(50))
+
+
+def test_parse_headers_50_memmove(benchmark):
+    benchmark(parse, build_response(50), MemmoveResponse)
+
+
+def test_parse_headers_100(benchmark):
+    benchmark(parse, build_response(100))
+
+
+def test_parse_headers_100_memmove(benchmark):
+    benchmark(parse, build_response(100), MemmoveResponse)
+
+
+def test_parse_headers_200(benchmark):
+    benchmark(parse, build_response(200))
+
+
+def test_parse_headers_200_memmove(benchmark):
+    benchmark(parse, build_response(200), MemmoveResponse)
+
+
+def test_parse_headers_400(benchmark):
+    benchmark(parse, build_response(400))
+
+
+def test_parse_headers_400_memmove(benchmark):
+    benchmark(parse, build_response(400), MemmoveResponse)
+
+
+def main():
+    """Print the time per response for each header count and parser, and how many bytes the
+    memmove parser moves per response. The cursor moves none since the block fits the buffer."""
+    print(
+        f"{'headers':>8} {'block (KB)':>11} {'cursor (us)':>12} {'memmove (us)':>13} "
+        f"{'moved (KB)':>11}"
+    )
+    for count in HEADER_COUNTS:
+        response = build_response(count)
+        results = []
+        for response_class in (adafruit_requests.Response, MemmoveResponse):
+            timer = timeit.Timer(lambda: parse(response, response_class))
+            number, _ = timer.autorange()
+            results.append(min(timer.repeat(15, number)) / number * 1e6)
+        MemmoveResponse.bytes_moved = 0
+        parse(response, MemmoveResponse)
+        moved = MemmoveResponse.bytes_moved / 1024
+        print(
+            f"{count:>8} {len(response) / 1024:>11.1f} {results[0]:>12.1f} {results[1]:>13.1f} "
+            f"{moved:>11.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
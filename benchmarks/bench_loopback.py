@@ -0,0 +1,70 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: Unlicense
+
+"""Loopback benchmark.
+
+Makes requests with CPython's ``socket`` module to the server in ``tests/local_test_server.py``,
+so connecting, the kernel and the server's HTTP/1.0 handling are included in the time. Run it
+directly::
+
+    python benchmarks/bench_loopback.py
+
+or with pytest-benchmark::
+
+    pytest benchmarks/bench_loopback.py
+"""
+
+import os
+import socket
+import sys
+import timeit
+
+import memsocket  # noqa: F401 Puts the library next to the benchmarks first on sys.path
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tests")
+)
+
+from local_test_server import LocalTestServerHandler, uses_local_server  # noqa: E402
+
+import adafruit_requests  # noqa: E402
+
+URL = "http://127.0.0.1:5000"
+SESSION = adafruit_requests.Session(socket)
+
+# The server logs every request, which would bury the results.
+LocalTestServerHandler.log_message = lambda *args: None
+
+
+def get() -> dict:
+    return SESSION.get(URL + "/get").json()
+
+
+def post() -> dict:
+    return SESSION.post(URL + "/post", json={"value": 42}).json()
+
+
+@uses_local_server
+def test_loopback_get(benchmark):
+    benchmark(get)
+
+
+@uses_local_server
+def test_loopback_post(benchmark):
+    benchmark(post)
+
+
+@uses_local_server
+def main():
+    """Print the time per request and the requests per second."""
+    print(f"{'request':>8} {'time (us)':>11} {'req/s':>8}")
+    for name, function in (("GET", get), ("POST", post)):
+        timer = timeit.Timer(function)
+        number, _ = timer.autorange()
+        seconds = min(timer.repeat(5, number)) / number
+        print(f"{name:>8} {seconds * 1e6:>11.1f} {1 / seconds:>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: Unlicense
+
+"""Request and response hot path benchmarks.
+
+Drives `Session` against an in-memory socket for header parsing, chunked decoding,
+`Response.content`, `Response.json`, `Response.iter_content`, multipart uploads and redirects,
+each at several sizes. Run it directly to print the throughput, the peak memory allocated
+while making one request (from tracemalloc) and the number of socket sends and receives::
+
+    python benchmarks/bench_responses.py
+
+or with pytest-benchmark::
+
+    pytest benchmarks/bench_responses.py
+"""
+
+import json
+import timeit
+import tracemalloc
+
+import pytest
+from memsocket import MemoryPool, MemorySocket
+
+import adafruit_requests
+
+URL = "http://localhost/data"
+SIZES = (1024, 65536, 1048576)
+HEADER_COUNTS = (10, 50, 100)
+REDIRECT_HOPS = (1, 5, 10)
+CHUNK_SIZE = 4096
+OK = b"HTTP/1.1 200 OK\r\nContent-Length: 0\r\n\r\n"
+REDIRECT = b"HTTP/1.1 302 Found\r\nLocation: /data\r\nContent-Length: 0\r\n\r\n"
+
+
+def content_response(size: int) -> bytes:
+    """A response with ``size`` bytes of content and a Content-Length."""
+    return b"HTTP/1.1 200 OK\r\nContent-Length: %d\r\n\r\n" % size + bytes(size)
+
+
+def chunked_response(size: int) -> bytes:
+    """A response with ``size`` bytes of content sent in chunks of `CHUNK_SIZE` bytes."""
+    chunks = []
+    for start in range(0, size, CHUNK_SIZE):
+        length = min(CHUNK_SIZE, size - start)
+        chunks.append(b"%x\r\n" % length + bytes(length) + b"\r\n")
+    head = b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n"
+    return head + b"".join(chunks) + b"0\r\n\r\n"
+
+
+def json_response(size: int) -> bytes:
+    """A response with a JSON document of about ``size`` bytes."""
+    item = {"id": 1234, "name": "sensor", "value": 21.5, "ok": True}
+    items = [item] * max(1, size // len(json.dumps(item)))
+    body = bytes(json.dumps({"items": items}), "utf-8")
+    head = b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nContent-Length: %d\r\n\r\n"
+    return head % len(body) + body
+
+
+def headers_response(count: int) -> bytes:
+    """A response with ``count`` headers and no content."""
+    lines = [b"HTTP/1.1 200 OK"]
+    for i in range(count):
+        lines.append(b"X-Header-%d: %s" % (i, b"v" * (20 + i % 40)))
+    lines.append(b"Content-Length: 0")
+    return b"\r\n".join(lines) + b"\r\n\r\n"
+
+
+SOCKET = MemorySocket()
+SESSION = adafruit_requests.Session(MemoryPool(SOCKET))
+
+
+def get_headers(response: bytes) -> int:
+    SOCKET.reset(response)
+    return len(SESSION.get(URL).headers)
+
+
+def get_content(response: bytes) -> int:
+    SOCKET.reset(response)
+    return len(SESSION.get(URL).content)
+
+
+def get_json(response: bytes) -> int:
+    SOCKET.reset(response)
+    return len(SESSION.get(URL).json()["items"])
+
+
+def iter_content(response: bytes) -> int:
+    SOCKET.reset(response)
+    size = 0
+    with SESSION.get(URL, stream=True) as streamed:
+        for chunk in streamed.iter_content(CHUNK_SIZE):
+            size += len(chunk)
+    return size
+
+
+def post_multipart(data: bytes) -> int:
+    SOCKET.reset(OK)
+    SESSION.post(URL, files={"file": ("data.bin", data, "application/octet-stream")}).close()
+    return SOCKET.bytes_sent
+
+
+def follow_redirects(responses: tuple) -> int:
+    SOCKET.reset(*responses)
+    return SESSION.get(URL).status_code
+
+
+# name, function, argument builder, the sizes, and what a size counts
+CASES = (
+    ("headers", get_headers, headers_response, HEADER_COUNTS, "headers"),
+    ("content", get_content, content_response, SIZES, "bytes"),
+    ("chunked", get_content, chunked_response, SIZES, "bytes"),
+    ("json", get_json, json_response, SIZES, "bytes"),
+    ("iter_content", iter_content, content_response, SIZES, "bytes"),
+    ("multipart", post_multipart, bytes, SIZES, "bytes"),
+    ("redirects", follow_redirects, lambda hops: (REDIRECT,) * hops + (OK,), REDIRECT_HOPS, "hops"),
+)
+
+
+def measure(function, argument) -> dict:
+    """Time function(argument) and measure the memory it allocates and the syscalls it makes.
+    Returns the best time per call in seconds, the peak bytes allocated by one call, and the
+    sends and receives of one call."""
+    function(argument)
+    timer = timeit.Timer(lambda: function(argument))
+    number, _ = timer.autorange()
+    seconds = min(timer.repeat(5, number)) / number
+
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        function(argument)
+        peak = tracemalloc.get_traced_memory()[1] - before
+    finally:
+        tracemalloc.stop()
+    return {
+        "seconds": seconds,
+        "peak": peak,
+        "sends": SOCKET.send_calls,
+        "receives": SOCKET.recv_calls,
+    }
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_content(benchmark, size):
+    benchmark(get_content, content_response(size))
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_chunked(benchmark, size):
+    benchmark(get_content, chunked_response(size))
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_json(benchmark, size):
+    benchmark(get_json, json_response(size))
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_iter_content(benchmark, size):
+    benchmark(iter_content, content_response(size))
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_multipart(benchmark, size):
+    benchmark(post_multipart, bytes(size))
+
+
+@pytest.mark.parametrize("count", HEADER_COUNTS)
+def test_headers(benchmark, count):
+    benchmark(get_headers, headers_response(count))
+
+
+@pytest.mark.parametrize("hops", REDIRECT_HOPS)
+def test_redirects(benchmark, hops):
+    benchmark(follow_redirects, (REDIRECT,) * hops + (OK,))
+
+
+def main():
+    """Print the results of every case."""
+    print(
+        f"{'case':<13} {'size':>12} {'time (us)':>11} {'MB/s':>9} {'peak (KB)':>10} "
+        f"{'sends':>6} {'recvs':>6}"
+    )
+    for name, function, build, sizes, unit in CASES:
+        for size in sizes:
+            result = measure(function, build(size))
+            seconds = result["seconds"]
+            throughput = f"{size / seconds / 1e6:.1f}" if unit == "bytes" else "-"
+            print(
+                f"{name:<13} {f'{size} {unit}':>12} {seconds * 1e6:>11.1f} {throughput:>9} "
+                f"{result['peak'] / 1024:>10.1f} {result['sends']:>6} {result['receives']:>6}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: Unlicense
+
+"""File upload benchmark.
+
+Posts a 2 MB file through `Session` with several ``upload_chunk_size`` values, and with the
+36 byte loop `Session._send_file` used before the upload buffer was added. Run it directly::
+
+    python benchmarks/bench_upload.py
+
+or with pytest-benchmark::
+
+    pytest benchmarks/bench_upload.py
+"""
+
+import io
+import time
+
+from memsocket import MemoryPool, MemorySocket
+
+import adafruit_requests
+
+UPLOAD_SIZE = 2 * 1024 * 1024
+CHUNK_SIZES = (1024, 4096, 16384)
+RESPONSE = b"HTTP/1.1 200 OK\r\nContent-Length: 0\r\n\r\n"
+URL = "http://localhost/upload"
+
+
+class LegacySession(adafruit_requests.Session):
+    """`Session` with the file upload loop used before the upload buffer was added."""
+
+    def _send_file(self, socket, file_handle):
+        chunk_size = 36
+        b = bytearray(chunk_size)
+        while True:
+            size = file_handle.readinto(b)
+            if size == 0:
+                break
+            self._send(socket, b[:size])
+
+
+DATA = io.BytesIO(bytes(UPLOAD_SIZE))
+SOCKET = MemorySocket(RESPONSE)
+
+
+def upload(session: adafruit_requests.Session) -> MemorySocket:
+    """Post the file and return the socket, with its counters for the upload."""
+    DATA.seek(0)
+    SOCKET.reset()
+    session.post(URL, data=DATA).close()
+    return SOCKET
+
+
+def session(upload_chunk_size: int = 4096, session_class: type = adafruit_requests.Session):
+    """A session that sends to `SOCKET`."""
+    return session_class(MemoryPool(SOCKET), upload_chunk_size=upload_chunk_size)
+
+
+def test_upload_4096(benchmark):
+    benchmark(upload, session(4096))
+
+
+def test_upload_16384(benchmark):
+    benchmark(upload, session(16384))
+
+
+def test_upload_legacy(benchmark):
+    benchmark(upload, session(session_class=LegacySession))
+
+
+def main():
+    """Print the throughput and number of sends for each way of uploading."""
+    print(f"{'chunk':>8} {'MB/s':>9} {'sends':>7}")
+    runs = [("36 (old)", session(session_class=LegacySession))]
+    runs += [(str(size), session(size)) for size in CHUNK_SIZES]
+    for name, upload_session in runs:
+        best = None
+        for _ in range(3):
+            start = time.perf_counter()
+            sock = upload(upload_session)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        print(f"{name:>8} {UPLOAD_SIZE / best / 1e6:>9.1f} {sock.send_calls:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: Unlicense
+
+"""In-memory socket and socket pool for benchmarks.
+
+Unlike ``tests/mocket.py`` these avoid ``unittest.mock`` so that the time measured is spent in
+``adafruit_requests`` rather than in the mocks. Each socket counts its syscalls.
+"""
+
+import os
+import sys
+
+# Benchmarks are run from a checkout, make sure the library next to them is the one imported.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+MSS = 1460
+
+
+class MemorySocket:
+    """A socket that replays ``response`` and discards everything sent to it.
+
+    ``max_recv`` caps the bytes returned by a single receive, like a TCP segment would.
+    """
+
+    def __init__(self, response: bytes = b"", max_recv: int = MSS) -> None:
+        self.max_recv = max_recv
+        self.reset(response)
+
+    def reset(self, response: bytes = None, *responses: bytes) -> None:
+        """Rewind the response (or replace it) and zero the counters. Each of ``responses``
+        is made available once another request has been sent, like a server would, so none of
+        it is received along with the response before."""
+        if response is not None:
+            self._first = memoryview(response)
+            self._responses = responses
+        self._response = self._first
+        self._requests = 0
+        self._tail = b""
+        self._position = 0
+        self.send_calls = 0
+        self.recv_calls = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+
+    def settimeout(self, timeout: float) -> None:
+        pass
+
+    def connect(self, address: tuple) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+    def send(self, data: bytes) -> int:
+        self.send_calls += 1
+        self.bytes_sent += len(data)
+        if self._responses:
+            self._queue_response(data)
+        return len(data)
+
+    def _queue_response(self, data: bytes) -> None:
+        # Requests without a body end with a blank line.
+        self._tail = (self._tail + bytes(data[-4:]))[-4:]
+        if self._tail != b"\r\n\r\n":
+            return
+        self._tail = b""
+        self._requests += 1
+        if 1 < self._requests <= len(self._responses) + 1:
+            unread = bytes(self._response[self._position :])
+            self._response = memoryview(unread + self._responses[self._requests - 2])
+            self._position = 0
+
+    def recv(self, count: int) -> bytes:
+        self.recv_calls += 1
+        end = min(self._position + count, self._position + self.max_recv)
+        data = bytes(self._response[self._position : end])
+        self._position += len(data)
+        self.bytes_received += len(data)
+        return data
+
+    def recv_into(self, buf: bytearray, nbytes: int = 0) -> int:
+        self.recv_calls += 1
+        read = nbytes if nbytes > 0 else len(buf)
+        read = min(read, self.max_recv, len(self._response) - self._position)
+        end = self._position + read
+        buf[:read] = self._response[self._position : end]
+        self._position = end
+        self.bytes_received += read
+        return read
+
+    @property
+    def syscalls(self) -> int:
+        """Sends and receives made so far."""
+        return self.send_calls + self.recv_calls
+
+
+class MemoryPool:
+    """A socket pool handing out a single `MemorySocket`."""
+
+    SOCK_STREAM = 0
+    AF_INET = 2
+
+    def __init__(self, sock: MemorySocket = None) -> None:
+        self.sock = sock or MemorySocket()
+
+    def getaddrinfo(self, host, port, family=0, socktype=0, proto=0, flags=0):  # noqa: PLR0913
+        return ((self.AF_INET, self.SOCK_STREAM, proto, "", (host, port)),)
+
+    def socket(self, family=0, socktype=0, proto=0):
+        return self.sock
@@ -0,0 +1,37 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: Unlicense
+
+"""Run the benchmarks and print their results.
+
+Runs every ``bench_*.py`` next to this script, or only the ones named::
+
+    python benchmarks/run.py
+    python benchmarks/run.py responses upload
+
+The loopback benchmark starts the server from ``tests/local_test_server.py`` on port 5000.
+"""
+
+import importlib
+import os
+import sys
+
+
+def main(names):
+    """Run the ``main`` of each named benchmark module, or of all of them."""
+    directory = os.path.dirname(os.path.abspath(__file__))
+    sys.path.insert(0, directory)
+    if not names:
+        names = sorted(
+            name[6:-3]
+            for name in os.listdir(directory)
+            if name.startswith("bench_") and name.endswith(".py")
+        )
+    for name in names:
+        print(f"== {name} ==")
+        importlib.import_module(f"bench_{name}").main()
+        print()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
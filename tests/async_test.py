@@ -0,0 +1,222 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: Unlicense
+
+"""Async Tests"""
+
+import asyncio
+import errno
+import socket
+
+import mocket
+import pytest
+
+import adafruit_requests
+
+REQUEST = (
+    b"GET /testwifi/index.html HTTP/1.1\r\n"
+    b"Host: wifitest.adafruit.com\r\n"
+    b"User-Agent: Adafruit CircuitPython\r\n\r\n"
+)
+CHUNKED_RESPONSE = (
+    b"HTTP/1.1 200 OK\r\n"
+    b"Transfer-Encoding: chunked\r\n\r\n"
+    b"7\r\nchunked\r\n"
+    b"9\r\n response\r\n"
+    b"0\r\nX-Trailer: yes\r\n\r\n"
+)
+JSON_RESPONSE = b'HTTP/1.1 200 OK\r\nContent-Length: 14\r\n\r\n{"answer": 42}'
+
+
+def _respond_per_request(sock, *responses):
+    """Make the next response available each time a request is sent, like a server would."""
+    responses = list(responses)
+    sock._response = b""
+    send = sock.send.side_effect
+
+    def send_and_respond(data):
+        sock._response = sock._response[sock._position :] + responses.pop(0)
+        sock._position = 0
+        return send(data)
+
+    sock.send.side_effect = send_and_respond
+
+
+def test_get(pool, sock):
+    async def main():
+        session = adafruit_requests.AsyncSession(pool)
+        response = await session.get("http://" + mocket.MOCK_ENDPOINT_1)
+        assert response.status_code == 200
+        assert await response.text() == str(mocket.MOCK_RESPONSE_TEXT, "utf-8")
+
+    asyncio.run(main())
+    assert b"".join(sock.sent_data) == REQUEST
+    sock.settimeout.assert_called_with(0)
+
+
+def test_json(pool, sock):
+    sock._response = JSON_RESPONSE
+
+    async def main():
+        session = adafruit_requests.AsyncSession(pool)
+        response = await session.get("http://" + mocket.MOCK_ENDPOINT_1)
+        return await response.json()
+
+    assert asyncio.run(main()) == {"answer": 42}
+
+
+def test_iter_content_chunked(pool, sock):
+    sock._response = CHUNKED_RESPONSE
+
+    async def main():
+        session = adafruit_requests.AsyncSession(pool)
+        response = await session.get("http://" + mocket.MOCK_ENDPOINT_1, stream=True)
+        chunks = []
+        async for chunk in response.iter_content(chunk_size=4):
+            chunks.append(chunk)
+        return response, chunks
+
+    response, chunks = asyncio.run(main())
+    assert b"".join(chunks) == b"chunked response"
+    assert max(len(chunk) for chunk in chunks) == 4
+    assert response.headers["x-trailer"] == "yes"
+
+
+def test_connection_reused(pool, sock):
+    _respond_per_request(sock, JSON_RESPONSE, JSON_RESPONSE)
+
+    async def main():
+        session = adafruit_requests.AsyncSession(pool)
+        for _ in range(2):
+            response = await session.get("http://" + mocket.MOCK_ENDPOINT_1)
+            assert await response.json() == {"answer": 42}
+
+    asyncio.run(main())
+    assert pool.socket.call_count == 1
+    assert b"".join(sock.sent_data) == REQUEST * 2
+
+
+def test_concurrent_requests_use_their_own_sockets(pool):
+    sock1 = mocket.Mocket(JSON_RESPONSE)
+    sock2 = mocket.Mocket(JSON_RESPONSE)
+    pool.socket.side_effect = [sock1, sock2]
+
+    async def main():
+        session = adafruit_requests.AsyncSession(pool)
+        responses = await asyncio.gather(
+            session.get("http://" + mocket.MOCK_ENDPOINT_1, stream=True),
+            session.get("http://" + mocket.MOCK_ENDPOINT_1, stream=True),
+        )
+        return [await response.json() for response in responses]
+
+    assert asyncio.run(main()) == [{"answer": 42}, {"answer": 42}]
+    assert sock1.sent_data == [REQUEST]
+    assert sock2.sent_data == [REQUEST]
+
+
+def test_waits_for_data(pool, sock):
+    recv_into = sock.recv_into.side_effect
+    waits = [OSError(errno.EAGAIN, "EAGAIN"), OSError(errno.EAGAIN, "EAGAIN")]
+
+    def not_ready_yet(buf, nbytes=0):
+        if waits:
+            raise waits.pop()
+        return recv_into(buf, nbytes)
+
+    sock.recv_into.side_effect = not_ready_yet
+
+    async def main():
+        session = adafruit_requests.AsyncSession(pool)
+        response = await session.get("http://" + mocket.MOCK_ENDPOINT_1)
+        return await response.content()
+
+    assert asyncio.run(main()) == mocket.MOCK_RESPONSE_TEXT
+    assert not waits
+
+
+def test_stale_connection_retried(pool):
+    sock1 = mocket.Mocket(JSON_RESPONSE)
+    sock2 = mocket.Mocket(JSON_RESPONSE)
+    pool.socket.side_effect = [sock1, sock2]
+
+    async def main():
+        session = adafruit_requests.AsyncSession(pool)
+        for _ in range(2):
+            response = await session.get("http://" + mocket.MOCK_ENDPOINT_1)
+            assert await response.json() == {"answer": 42}
+
+    asyncio.run(main())
+    # The first socket had nothing left to read so it was closed and replaced.
+    sock1.close.assert_called_once()
+    assert sock2.sent_data == [REQUEST]
+
+
+def test_no_response(pool, sock):
+    sock._response = b""
+
+    async def main():
+        session = adafruit_requests.AsyncSession(pool)
+        await session.get("http://" + mocket.MOCK_ENDPOINT_1)
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(main())
+    sock.close.assert_called_once()
+
+
+def test_redirect(pool):
+    redirect = b"HTTP/1.1 301 Moved\r\nLocation: /moved\r\nContent-Length: 0\r\n\r\n"
+    sock = mocket.Mocket()
+    _respond_per_request(sock, redirect, JSON_RESPONSE)
+    pool.socket.return_value = sock
+
+    async def main():
+        session = adafruit_requests.AsyncSession(pool)
+        response = await session.get("http://" + mocket.MOCK_ENDPOINT_1)
+        return await response.json()
+
+    assert asyncio.run(main()) == {"answer": 42}
+    assert sock.sent_data[1].startswith(b"GET /moved HTTP/1.1\r\n")
+
+
+def test_too_many_redirects(pool):
+    redirect = b"HTTP/1.1 302 Found\r\nLocation: /again\r\nContent-Length: 0\r\n\r\n"
+    sock = mocket.Mocket()
+    _respond_per_request(sock, redirect, redirect, redirect)
+    pool.socket.return_value = sock
+
+    async def main():
+        session = adafruit_requests.AsyncSession(pool, max_redirects=2)
+        await session.get("http://" + mocket.MOCK_ENDPOINT_1)
+
+    with pytest.raises(adafruit_requests.TooManyRedirects):
+        asyncio.run(main())
+    assert len(sock.sent_data) == 3
+
+
+def test_streams():
+    async def handle(reader, writer):
+        try:
+            while True:
+                await reader.readuntil(b"\r\n\r\n")
+                writer.write(CHUNKED_RESPONSE)
+                await writer.drain()
+        except asyncio.IncompleteReadError:
+            writer.close()
+
+    async def main():
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        session = adafruit_requests.AsyncSession(socket)
+        try:
+            results = []
+            for _ in range(2):
+                response = await session.get(f"http://127.0.0.1:{port}/")
+                results.append(await response.text())
+            return results, len(session._idle[("http:", "127.0.0.1", port)])
+        finally:
+            session.close()
+            server.close()
+
+    results, idle = asyncio.run(main())
+    assert results == ["chunked response", "chunked response"]
+    assert idle == 1
@@ -0,0 +1,131 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: Unlicense
+
+"""Cache Tests"""
+
+import mocket
+import pytest
+
+import adafruit_requests
+
+URL = "http://" + mocket.MOCK_ENDPOINT_1
+TEXT = str(mocket.MOCK_RESPONSE_TEXT, "utf-8")
+
+
+def _response(*headers):
+    head = b"HTTP/1.1 200 OK\r\n" + b"".join(header + b"\r\n" for header in headers)
+    return head + b"Content-Length: 70\r\n\r\n" + mocket.MOCK_RESPONSE_TEXT
+
+
+@pytest.fixture
+def cache():
+    return adafruit_requests.MemoryCache()
+
+
+def _session(pool, cache, *responses):
+    sock = mocket.Mocket(b"".join(responses))
+    pool.socket.return_value = sock
+    return sock, adafruit_requests.Session(pool, cache=cache)
+
+
+def test_etag_revalidated(pool, cache):
+    not_modified = b'HTTP/1.1 304 Not Modified\r\nETag: "abc"\r\n\r\n'
+    sock, requests_session = _session(pool, cache, _response(b'ETag: "abc"'), not_modified)
+
+    assert requests_session.get(URL).text == TEXT
+    response = requests_session.get(URL)
+    assert response.status_code == 200
+    assert response.headers["etag"] == '"abc"'
+    assert response.text == TEXT
+
+    assert b'If-None-Match: "abc"\r\n' in b"".join(sock.sent_data)
+    pool.socket.assert_called_once()
+
+
+def test_last_modified_revalidated(pool, cache):
+    last_modified = b"Last-Modified: Sat, 25 Jun 2022 21:08:49 GMT"
+    sock, requests_session = _session(
+        pool, cache, _response(last_modified), _response(last_modified)
+    )
+
+    requests_session.get(URL).close()
+    assert requests_session.get(URL).text == TEXT
+
+    sent = b"".join(sock.sent_data)
+    assert b"If-Modified-Since: Sat, 25 Jun 2022 21:08:49 GMT\r\n" in sent
+
+
+def test_max_age_skips_network(pool, cache):
+    sock, requests_session = _session(pool, cache, _response(b"Cache-Control: max-age=60"))
+
+    assert requests_session.get(URL).text == TEXT
+    sent = sock.send.call_count
+    assert requests_session.get(URL).text == TEXT
+    assert sock.send.call_count == sent
+
+
+@pytest.mark.parametrize(
+    "header",
+    (
+        b"Cache-Control: no-store, max-age=60",
+        b"Cache-Control: max-age=60\r\nVary: User-Agent",
+        b"X-Nothing: to-validate-with",
+    ),
+)
+def test_not_stored(pool, cache, header):
+    sock, requests_session = _session(pool, cache, _response(header), _response(header))
+
+    assert requests_session.get(URL).text == TEXT
+    assert requests_session.get(URL).text == TEXT
+    assert b"".join(sock.sent_data).count(b"GET /") == 2
+
+
+def test_stream_not_cached(pool, cache):
+    header = b"Cache-Control: max-age=60"
+    sock, requests_session = _session(pool, cache, _response(header), _response(header))
+
+    requests_session.get(URL, stream=True).close()
+    assert cache.get(URL) is None
+
+
+def test_memory_cache_lru():
+    entry = adafruit_requests.CacheEntry(_response())
+    cache = adafruit_requests.MemoryCache(max_size=len(entry.data) * 2 + 1)
+    cache.set("a", entry)
+    cache.set("b", entry)
+    cache.get("a")
+    cache.set("c", entry)
+
+    assert cache.get("a") is entry
+    assert cache.get("b") is None
+    assert cache.get("c") is entry
+
+
+def test_file_cache(tmp_path):
+    directory = str(tmp_path / "cache")
+    entry = adafruit_requests.CacheEntry(_response(b'ETag: "abc"'), expires=1e12)
+    cache = adafruit_requests.FileCache(directory)
+    cache.set(URL, entry)
+    assert cache.get(URL).data == entry.data
+
+    reopened = adafruit_requests.FileCache(directory)
+    stored = reopened.get(URL)
+    assert stored.data == entry.data
+    assert stored.headers["etag"] == '"abc"'
+    # Freshness isn't kept across runs.
+    assert not stored.fresh()
+
+    reopened.delete(URL)
+    assert adafruit_requests.FileCache(directory).get(URL) is None
+
+
+def test_file_cache_oversize_replacement(tmp_path):
+    directory = str(tmp_path / "cache")
+    cache = adafruit_requests.FileCache(directory, max_size=256)
+    cache.set(URL, adafruit_requests.CacheEntry(_response(b'ETag: "abc"'), expires=1e12))
+
+    cache.set(URL, adafruit_requests.CacheEntry(_response(b"X-Big: " + b"x" * 256), 1e12))
+
+    assert cache.get(URL) is None
+    assert adafruit_requests.FileCache(directory, max_size=256).get(URL) is None
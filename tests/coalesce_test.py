@@ -0,0 +1,125 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: Unlicense
+
+"""Coalesce Tests"""
+
+import threading
+import time
+
+import mocket
+import pytest
+
+import adafruit_requests
+
+TEXT = str(mocket.MOCK_RESPONSE_TEXT, "utf-8")
+URL = "http://" + mocket.MOCK_ENDPOINT_1
+
+
+def _get_from_threads(requests_session, count, **kwargs):
+    """Call get from count threads and return their results once the followers are waiting."""
+    results = [None] * count
+
+    def get(index):
+        try:
+            results[index] = requests_session.get(URL, **kwargs).text
+        except Exception as exc:
+            results[index] = exc
+
+    threads = [threading.Thread(target=get, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    deadline = time.monotonic() + 5
+    while requests_session.coalesce_stats["hits"] < count - 1 and time.monotonic() < deadline:
+        time.sleep(0.001)
+    return threads, results
+
+
+def _blocked(sock):
+    """Hold up the response until the returned event is set."""
+    release = threading.Event()
+    recv = sock.recv.side_effect
+
+    def blocked_recv(count):
+        release.wait(5)
+        return recv(count)
+
+    sock.recv.side_effect = blocked_recv
+    return release
+
+
+def test_concurrent_gets_share_request(pool, sock):
+    release = _blocked(sock)
+    requests_session = adafruit_requests.Session(pool, coalesce=True)
+
+    threads, results = _get_from_threads(requests_session, 4)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert results == [TEXT] * 4
+    assert pool.socket.call_count == 1
+    assert requests_session.coalesce_stats == {"hits": 3, "misses": 1}
+
+
+def test_failure_shared(pool, sock):
+    sock._response = b""
+    release = _blocked(sock)
+    pool.socket.side_effect = [sock, mocket.Mocket(b"")]
+    requests_session = adafruit_requests.Session(pool, coalesce=True)
+
+    threads, results = _get_from_threads(requests_session, 3)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert all(isinstance(result, adafruit_requests.OutOfRetries) for result in results)
+    assert requests_session._in_flight == {}
+
+
+def test_one_after_another(pool, sock):
+    sock._response = mocket.MOCK_RESPONSE * 2
+    requests_session = adafruit_requests.Session(pool, coalesce=True)
+
+    assert requests_session.get(URL).text == TEXT
+    assert requests_session.get(URL).text == TEXT
+
+    assert requests_session.coalesce_stats == {"hits": 0, "misses": 2}
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    (
+        {"stream": True},
+        {"data": "body"},
+    ),
+)
+def test_not_coalesced(pool, kwargs):
+    requests_session = adafruit_requests.Session(pool, coalesce=True)
+
+    requests_session.request("GET", URL, **kwargs)
+
+    assert requests_session.coalesce_stats == {"hits": 0, "misses": 0}
+
+
+def test_head_keeps_content_length(pool, sock):
+    sock._response = b"HTTP/1.1 200 OK\r\nContent-Length: 12345\r\nETag: abc\r\n\r\n"
+    requests_session = adafruit_requests.Session(pool, coalesce=True)
+
+    response = requests_session.head(URL)
+
+    assert response.headers["content-length"] == "12345"
+    assert response.headers["etag"] == "abc"
+    assert response.content == b""
+
+
+@pytest.mark.parametrize(
+    ("method", "kwargs"), (("POST", {"json": {"a": 1}}), ("GET", {"stream": True}))
+)
+def test_coalesced_get_while_response_open(pool, sock, method, kwargs):
+    pool.socket.side_effect = [sock, mocket.Mocket()]
+    requests_session = adafruit_requests.Session(pool, coalesce=True)
+    first = requests_session.request(method, URL, **kwargs)
+
+    assert requests_session.get(URL).text == TEXT
+    assert first.text == TEXT
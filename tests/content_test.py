@@ -0,0 +1,85 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: Unlicense
+
+"""Content Tests"""
+
+import mocket
+import pytest
+from chunk_test import _chunk
+
+import adafruit_requests
+
+BODY = bytes(range(256)) * 400
+
+
+def _get(pool, response):
+    sock = mocket.Mocket(response)
+    pool.socket.return_value = sock
+    requests_session = adafruit_requests.Session(pool)
+    return sock, requests_session.get("http://" + mocket.MOCK_ENDPOINT_1)
+
+
+def test_content_length(pool):
+    headers = b"HTTP/1.1 200 OK\r\nContent-Length: %d\r\n\r\n" % len(BODY)
+    sock, response = _get(pool, headers + BODY)
+
+    calls = sock.recv_into.call_count
+    assert response.content == BODY
+    # The body is read straight into one buffer rather than 32 bytes at a time.
+    assert sock.recv_into.call_count - calls <= 2
+    assert response.socket is None
+
+
+def test_content_chunked(pool):
+    headers = b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n"
+    sock, response = _get(pool, headers + _chunk(BODY, 5000))
+
+    assert response.content == BODY
+    assert response.socket is None
+
+
+def test_content_no_length(pool):
+    headers = b"HTTP/1.0 200 OK\r\n\r\n"
+    sock, response = _get(pool, headers + BODY)
+
+    assert response.content == BODY
+
+
+def test_content_head_chunked(pool):
+    sock = mocket.Mocket(b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n")
+    pool.socket.return_value = sock
+    requests_session = adafruit_requests.Session(pool)
+    response = requests_session.head("http://" + mocket.MOCK_ENDPOINT_1)
+
+    assert response.content == b""
+
+
+def test_readinto(pool):
+    headers = b"HTTP/1.1 200 OK\r\nContent-Length: %d\r\n\r\n" % len(BODY)
+    sock, response = _get(pool, headers + BODY)
+
+    buf = bytearray(len(BODY) + 10)
+    assert response.readinto(buf) == len(BODY)
+    assert buf[: len(BODY)] == BODY
+    # The socket received straight into the caller's buffer.
+    assert sock.recv_into.call_args[0][0].obj is buf
+    assert response.readinto(buf) == 0
+
+
+def test_readinto_chunked(pool):
+    headers = b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n"
+    sock, response = _get(pool, headers + _chunk(BODY, 5000))
+
+    buf = bytearray(len(BODY))
+    response.readinto_exact(memoryview(buf))
+    assert buf == BODY
+
+
+def test_readinto_exact_short(pool):
+    headers = b"HTTP/1.1 200 OK\r\nContent-Length: %d\r\n\r\n" % len(BODY)
+    sock, response = _get(pool, headers + BODY)
+
+    with pytest.raises(EOFError) as context:
+        response.readinto_exact(bytearray(len(BODY) + 1))
+    assert f"Content ended after {len(BODY)} of {len(BODY) + 1} bytes" in str(context)
@@ -0,0 +1,104 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: Unlicense
+
+"""Decompression Tests"""
+
+import gzip
+import json
+import zlib
+
+import mocket
+import pytest
+from chunk_test import _chunk
+
+import adafruit_requests
+
+DOCUMENT = {"readings": [{"sensor": i, "value": i * 1.5} for i in range(500)]}
+BODY = json.dumps(DOCUMENT).encode("utf-8")
+
+
+def _raw_deflate(data):
+    compressor = zlib.compressobj(wbits=-15)
+    return compressor.compress(data) + compressor.flush()
+
+
+ENCODED = {
+    "gzip": gzip.compress(BODY),
+    "deflate": zlib.compress(BODY),
+    "raw deflate": _raw_deflate(BODY),
+}
+
+
+def _get(pool, encoding, chunked=False, decompress=True):
+    body = ENCODED[encoding]
+    headers = b"HTTP/1.1 200 OK\r\nContent-Encoding: %s\r\n" % encoding.split()[-1].encode()
+    if chunked:
+        headers += b"Transfer-Encoding: chunked\r\n\r\n"
+        body = _chunk(body, 300)
+    else:
+        headers += b"Content-Length: %d\r\n\r\n" % len(body)
+    sock = mocket.Mocket(headers + body)
+    pool.socket.return_value = sock
+    requests_session = adafruit_requests.Session(pool, decompress=decompress)
+    return sock, requests_session.get("http://" + mocket.MOCK_ENDPOINT_1)
+
+
+@pytest.mark.parametrize("chunked", (False, True))
+@pytest.mark.parametrize("encoding", ENCODED.keys())
+def test_content(pool, encoding, chunked):
+    sock, response = _get(pool, encoding, chunked)
+
+    assert response.content == BODY
+
+
+@pytest.mark.parametrize("encoding", ENCODED.keys())
+def test_text(pool, encoding):
+    sock, response = _get(pool, encoding)
+
+    assert response.text == str(BODY, "utf-8")
+
+
+@pytest.mark.parametrize("encoding", ENCODED.keys())
+def test_json(pool, encoding):
+    sock, response = _get(pool, encoding)
+
+    assert response.json() == DOCUMENT
+
+
+def test_json_select(pool):
+    sock, response = _get(pool, "gzip", chunked=True)
+
+    assert response.json(select=["readings", 321, "value"]) == 321 * 1.5
+
+
+def test_iter_content(pool):
+    sock, response = _get(pool, "gzip")
+
+    chunks = list(response.iter_content(chunk_size=100))
+    assert b"".join(chunks) == BODY
+    assert max(len(chunk) for chunk in chunks) == 100
+
+
+def test_accept_encoding(pool):
+    sock, response = _get(pool, "gzip")
+
+    assert b"Accept-Encoding: gzip, deflate\r\n" in b"".join(sock.sent_data)
+
+
+def test_accept_encoding_replace(pool, sock):
+    requests_session = adafruit_requests.Session(pool, decompress=True)
+    requests_session.get("http://" + mocket.MOCK_ENDPOINT_1, headers={"accept-encoding": "gzip"})
+
+    sent = b"".join(sock.sent_data)
+    assert b"accept-encoding: gzip\r\n" in sent
+    assert sent.lower().count(b"accept-encoding:") == 1
+
+
+def test_not_enabled(pool):
+    sock, response = _get(pool, "gzip", decompress=False)
+
+    assert b"Accept-Encoding" not in b"".join(sock.sent_data)
+    with pytest.raises(ValueError) as context:
+        result = response.text  # noqa: F841 Local variable not used
+    assert "Content-encoding is gzip" in str(context)
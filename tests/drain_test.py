@@ -0,0 +1,115 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: Unlicense
+
+"""Drain Tests"""
+
+import mocket
+
+import adafruit_requests
+
+URL = "http://" + mocket.MOCK_ENDPOINT_1
+TEXT = str(mocket.MOCK_RESPONSE_TEXT, "utf-8")
+CHUNKED = (
+    b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n5\r\nhello\r\n6\r\n world\r\n0\r\n\r\n"
+)
+
+
+def _respond_per_request(sock, *responses):
+    """Make the next response available once each request has been sent, like a server would,
+    so nothing of it is received with the response before."""
+    responses = list(responses)
+    request = bytearray()
+    sock._response = b""
+    send = sock.send.side_effect
+
+    def send_and_respond(data):
+        sent = send(data)
+        request.extend(data)
+        if request.endswith(b"\r\n\r\n"):
+            request.clear()
+            sock._response = sock._response[sock._position :] + responses.pop(0)
+            sock._position = 0
+        return sent
+
+    sock.send.side_effect = send_and_respond
+
+
+def test_unread_content_drained(pool, sock):
+    _respond_per_request(sock, mocket.MOCK_RESPONSE, mocket.MOCK_RESPONSE)
+    requests_session = adafruit_requests.Session(pool)
+
+    requests_session.get(URL, stream=True).close()
+    response = requests_session.get(URL)
+
+    assert response.text == TEXT
+    pool.socket.assert_called_once()
+    sock.close.assert_not_called()
+    assert requests_session.drain_stats == {"drained": 1, "bytes": 70, "closed": 0}
+
+
+def test_partly_read_chunked_content_drained(pool, sock):
+    _respond_per_request(sock, CHUNKED, mocket.MOCK_RESPONSE)
+    requests_session = adafruit_requests.Session(pool)
+
+    response = requests_session.get(URL, stream=True)
+    assert next(response.iter_content(5)) == b"hello"
+    response.close()
+
+    assert requests_session.get(URL).text == TEXT
+    pool.socket.assert_called_once()
+    assert requests_session.drain_stats == {"drained": 1, "bytes": 6, "closed": 0}
+
+
+def test_too_much_content_closes(pool, sock):
+    sock2 = mocket.Mocket()
+    pool.socket.side_effect = [sock, sock2]
+    requests_session = adafruit_requests.Session(pool, drain_limit=64)
+
+    requests_session.get(URL, stream=True).close()
+    response = requests_session.get(URL)
+
+    assert response.text == TEXT
+    sock.close.assert_called_once()
+    assert requests_session.drain_stats == {"drained": 0, "bytes": 0, "closed": 1}
+
+
+def test_connection_closed_while_draining(pool, sock):
+    sock._response = mocket.MOCK_RESPONSE[:-10]
+    requests_session = adafruit_requests.Session(pool)
+
+    requests_session.get(URL, stream=True).close()
+
+    sock.close.assert_called_once()
+    assert requests_session.drain_stats == {"drained": 0, "bytes": 0, "closed": 1}
+
+
+def test_read_content_not_counted(pool, sock):
+    _respond_per_request(sock, mocket.MOCK_RESPONSE, CHUNKED)
+    requests_session = adafruit_requests.Session(pool)
+
+    assert requests_session.get(URL).text == TEXT
+    assert requests_session.get(URL).text == "hello world"
+
+    sock.close.assert_not_called()
+    assert requests_session.drain_stats == {"drained": 0, "bytes": 0, "closed": 0}
+
+
+def test_content_without_length_not_counted(pool, sock):
+    sock._response = b"HTTP/1.1 200 OK\r\n\r\nhello"
+    requests_session = adafruit_requests.Session(pool)
+
+    assert requests_session.get(URL).content == b"hello"
+
+    # The content ended when the connection closed, so the socket can't be reused.
+    sock.close.assert_called_once()
+    assert requests_session.drain_stats == {"drained": 0, "bytes": 0, "closed": 0}
+
+
+def test_connection_close_header(pool, sock):
+    sock._response = b"HTTP/1.1 200 OK\r\nConnection: close\r\nContent-Length: 5\r\n\r\nhello"
+    requests_session = adafruit_requests.Session(pool)
+
+    assert requests_session.get(URL).text == "hello"
+
+    sock.close.assert_called_once()
@@ -0,0 +1,174 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: Unlicense
+
+"""Event Tests"""
+
+import mocket
+import pytest
+
+import adafruit_requests
+
+URL = "http://" + mocket.MOCK_ENDPOINT_1
+CHUNKED = (
+    b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n5\r\nhello\r\n6\r\n world\r\n0\r\n\r\n"
+)
+
+
+class Recorder:
+    def __init__(self):
+        self.events = []
+
+    def __call__(self, name, **fields):
+        self.events.append((name, fields))
+
+    @property
+    def names(self):
+        return [name for name, _ in self.events]
+
+    def fields(self, name):
+        return [fields for event, fields in self.events if event == name]
+
+
+def test_events_in_order(requests, sock):
+    recorder = Recorder()
+    requests.add_listener(recorder)
+
+    response = requests.get(URL)
+    content = response.content
+    response.close()
+
+    assert recorder.names == [
+        "connect_start",
+        "connect_end",
+        "head_sent",
+        "body_sent",
+        "first_byte",
+        "headers_parsed",
+        "body_complete",
+        "closed",
+    ]
+    assert {fields["request"] for _, fields in recorder.events} == {1}
+    times = [fields["time"] for _, fields in recorder.events]
+    assert times == sorted(times)
+    head = b"".join(call[0][0] for call in sock.send.call_args_list)
+    assert recorder.fields("head_sent")[0]["bytes"] == len(head)
+    assert recorder.fields("body_sent")[0]["bytes"] == 0
+    assert recorder.fields("connect_end")[0]["host"] == mocket.MOCK_HOST_1
+    assert recorder.fields("headers_parsed")[0]["status_code"] == 200
+    assert recorder.fields("body_complete")[0]["bytes"] == len(content)
+    assert recorder.fields("closed")[0]["kept"]
+
+
+@pytest.mark.parametrize("request_buffer_size", (0, 256))
+def test_body_bytes(pool, request_buffer_size):
+    requests_session = adafruit_requests.Session(pool, request_buffer_size=request_buffer_size)
+    recorder = Recorder()
+    requests_session.add_listener(recorder)
+
+    requests_session.post(URL, data=(part for part in (b"hello", b" world")))
+
+    body = b"5\r\nhello\r\n6\r\n world\r\n0\r\n\r\n"
+    assert recorder.fields("body_sent")[0]["bytes"] == len(body)
+
+
+def test_chunked_body_complete(pool, sock):
+    sock._response = CHUNKED
+    requests_session = adafruit_requests.Session(pool)
+    recorder = Recorder()
+    requests_session.add_listener(recorder)
+
+    response = requests_session.get(URL, stream=True)
+    assert "body_complete" not in recorder.names
+    assert response.content == b"hello world"
+
+    assert recorder.fields("body_complete") == [
+        {"request": 1, "bytes": 11, "time": recorder.fields("body_complete")[0]["time"]}
+    ]
+
+
+def test_second_request_reuses_socket(pool):
+    pool.socket.return_value = mocket.Mocket(mocket.MOCK_RESPONSE + mocket.MOCK_RESPONSE)
+    requests_session = adafruit_requests.Session(pool)
+    recorder = Recorder()
+    requests_session.add_listener(recorder)
+
+    requests_session.get(URL).close()
+    requests_session.get(URL).close()
+
+    assert [fields["reused"] for fields in recorder.fields("connect_end")] == [False, True]
+    assert [fields["request"] for fields in recorder.fields("connect_end")] == [1, 2]
+
+
+def test_removed_listener_not_called(requests):
+    recorder = Recorder()
+    requests.add_listener(recorder)
+    requests.remove_listener(recorder)
+
+    requests.get(URL).close()
+
+    assert recorder.events == []
+
+
+def test_histograms_buckets():
+    histograms = adafruit_requests.EventHistograms(bounds=(0.01, 0.1))
+    events = (
+        ("connect_start", 0.0),
+        ("connect_end", 0.005),
+        ("head_sent", 0.006),
+        ("body_sent", 0.006),
+        ("first_byte", 0.056),
+        ("headers_parsed", 0.057),
+        ("body_complete", 0.5),
+    )
+    for name, time in events:
+        histograms(name, request=1, time=time)
+
+    assert histograms.counts["connect"] == [1, 0, 0]
+    assert histograms.counts["first_byte"] == [0, 1, 0]
+    assert histograms.counts["total"] == [0, 0, 1]
+    assert histograms.sums["total"] == 0.5
+    assert histograms.percentile("first_byte", 50) == 0.1
+    assert histograms.percentile("total", 99) == float("inf")
+    assert histograms.percentile("body", 50) == float("inf")
+
+    histograms.clear()
+
+    assert histograms.count("total") == 0
+    assert histograms.percentile("total", 50) is None
+
+
+def test_histograms_skip_unfinished_requests(requests):
+    histograms = adafruit_requests.EventHistograms()
+    requests.add_listener(histograms)
+
+    requests.get(URL, stream=True).close()
+
+    assert histograms.count("total") == 0
+    assert not histograms._requests
+
+
+def test_failed_request(pool):
+    pool.socket.side_effect = [mocket.Mocket(b""), mocket.Mocket(b"")]
+    requests_session = adafruit_requests.Session(pool)
+    recorder = Recorder()
+    histograms = adafruit_requests.EventHistograms()
+    requests_session.add_listener(recorder)
+    requests_session.add_listener(histograms)
+
+    with pytest.raises(adafruit_requests.OutOfRetries) as raised:
+        requests_session.get(URL)
+
+    assert recorder.names[-1] == "failed"
+    assert recorder.fields("failed")[0]["error"] is raised.value
+    assert not histograms._requests
+
+
+def test_histograms_from_session(requests):
+    histograms = adafruit_requests.EventHistograms()
+    requests.add_listener(histograms)
+
+    assert requests.get(URL).text
+
+    for phase, _, _ in histograms.PHASES:
+        assert histograms.count(phase) == 1
@@ -0,0 +1,77 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: Unlicense
+
+"""JSON Select Tests"""
+
+import json
+
+import mocket
+import pytest
+from chunk_test import _chunk
+
+import adafruit_requests
+
+DOCUMENT = {
+    "meta": {"note": 'skip "this" } ] \\ please', "pages": [1, 2.5, None, True, False]},
+    "padding": "x" * 600,
+    "data": [
+        {"name": "first", "price": 1},
+        {"name": "second", "price": {"amount": 12.5, "currency": "€"}},
+    ],
+    "last": -3e-2,
+}
+ENCODED = json.dumps(DOCUMENT, indent=1).encode("utf-8")
+
+
+def _get(pool, body=ENCODED, chunked=False):
+    if chunked:
+        headers = b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n"
+        body = _chunk(body, 100)
+    else:
+        headers = b"HTTP/1.1 200 OK\r\nContent-Length: %d\r\n\r\n" % len(body)
+    pool.socket.return_value = mocket.Mocket(headers + body)
+    requests_session = adafruit_requests.Session(pool)
+    return requests_session.get("http://" + mocket.MOCK_HOST_1 + "/get")
+
+
+@pytest.mark.parametrize("chunked", (False, True))
+@pytest.mark.parametrize(
+    "path",
+    (
+        ["data", 1, "price"],
+        ["data", 0, "name"],
+        ["meta", "note"],
+        ["meta", "pages", 4],
+        ["meta"],
+        ["last"],
+        [],
+    ),
+)
+def test_select(pool, path, chunked):
+    expected = DOCUMENT
+    for key in path:
+        expected = expected[key]
+
+    assert _get(pool, chunked=chunked).json(select=path) == expected
+
+
+def test_select_missing_key(pool):
+    with pytest.raises(KeyError):
+        _get(pool).json(select=["data", 0, "missing"])
+
+
+def test_select_missing_index(pool):
+    with pytest.raises(IndexError):
+        _get(pool).json(select=["data", 2])
+
+
+def test_select_wrong_type(pool):
+    with pytest.raises(ValueError):
+        _get(pool).json(select=["data", "name"])
+
+
+def test_select_after_json(pool):
+    response = _get(pool)
+    assert response.json() == DOCUMENT
+    assert response.json(select=["data", 0, "price"]) == 1
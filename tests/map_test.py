@@ -0,0 +1,121 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: Unlicense
+
+"""Map Tests"""
+
+import mocket
+import pytest
+
+import adafruit_requests
+
+
+class EchoMocket(mocket.Mocket):
+    """Responds to each request with the method and path that were requested."""
+
+    def __init__(self):
+        super().__init__(b"")
+        self._request = bytearray()
+
+    def _send(self, data):
+        sent = super()._send(data)
+        self._request.extend(data)
+        if b"\r\n\r\n" in self._request:
+            request_line = bytes(self._request).split(b"\r\n", 1)[0]
+            body = b" ".join(request_line.split(b" ")[:2])
+            self._request = bytearray()
+            self._response = b"HTTP/1.1 200 OK\r\nContent-Length: %d\r\n\r\n%s" % (
+                len(body),
+                body,
+            )
+            self._position = 0
+        return sent
+
+
+@pytest.fixture
+def echo_pool(pool):
+    pool.socket.side_effect = lambda *args: EchoMocket()
+    return pool
+
+
+def test_map_in_order(echo_pool):
+    requests_session = adafruit_requests.Session(echo_pool)
+    urls = [f"http://{mocket.MOCK_HOST_1}/{i}" for i in range(10)]
+
+    responses = requests_session.map(urls, max_workers=4)
+
+    assert [response.text for response in responses] == [f"GET /{i}" for i in range(10)]
+    assert 1 <= echo_pool.socket.call_count <= 4
+
+
+def test_map_request_dictionaries(echo_pool):
+    requests_session = adafruit_requests.Session(echo_pool)
+    requests = [
+        {"method": "POST", "url": f"http://{mocket.MOCK_HOST_1}/post", "json": {"a": 1}},
+        {"url": f"http://{mocket.MOCK_HOST_2}/get", "timeout": 5},
+    ]
+
+    responses = requests_session.map(requests)
+
+    assert [response.text for response in responses] == ["POST /post", "GET /get"]
+
+
+def test_map_failures_in_place(echo_pool):
+    requests_session = adafruit_requests.Session(echo_pool)
+
+    responses = requests_session.map([f"http://{mocket.MOCK_HOST_1}/ok", "ftp://nope/"])
+
+    assert responses[0].text == "GET /ok"
+    assert isinstance(responses[1], ValueError)
+
+
+def test_map_fail_fast(echo_pool):
+    requests_session = adafruit_requests.Session(echo_pool)
+
+    with pytest.raises(ValueError):
+        requests_session.map([f"http://{mocket.MOCK_HOST_1}/ok", "ftp://nope/"], fail_fast=True)
+
+
+def test_as_completed(echo_pool):
+    requests_session = adafruit_requests.Session(echo_pool)
+    urls = [f"http://{mocket.MOCK_HOST_1}/{i}" for i in range(6)]
+
+    results = dict(requests_session.as_completed(urls, max_workers=3))
+
+    assert sorted(results) == list(range(6))
+    for index, response in results.items():
+        assert response.text == f"GET /{index}"
+
+
+def test_session_usable_after_map(echo_pool):
+    requests_session = adafruit_requests.Session(echo_pool, request_buffer_size=256)
+    requests_session.map([f"http://{mocket.MOCK_HOST_1}/{i}" for i in range(4)])
+
+    response = requests_session.get(f"http://{mocket.MOCK_HOST_1}/after")
+
+    assert response.text == "GET /after"
+    assert requests_session._lease_count == 0
+    assert requests_session._request_buffer is not None
+
+
+def test_map_head_keeps_headers(pool, sock):
+    sock._response = b"HTTP/1.1 200 OK\r\nContent-Length: 12345\r\n\r\n"
+    requests_session = adafruit_requests.Session(pool)
+
+    (response,) = requests_session.map(
+        [{"method": "HEAD", "url": "http://" + mocket.MOCK_ENDPOINT_1}]
+    )
+
+    assert response.headers["content-length"] == "12345"
+    assert response.content == b""
+
+
+def test_map_while_response_open(echo_pool):
+    requests_session = adafruit_requests.Session(echo_pool)
+    streamed = requests_session.get(f"http://{mocket.MOCK_HOST_1}/streamed", stream=True)
+
+    (response,) = requests_session.map([f"http://{mocket.MOCK_HOST_1}/mapped"])
+
+    assert response.text == "GET /mapped"
+    assert streamed.text == "GET /streamed"
+    assert requests_session.get(f"http://{mocket.MOCK_HOST_1}/after").text == "GET /after"
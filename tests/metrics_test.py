@@ -0,0 +1,136 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: Unlicense
+
+"""Metrics Tests"""
+
+import mocket
+
+import adafruit_requests
+
+URL = "http://" + mocket.MOCK_ENDPOINT_1
+REDIRECT = (
+    b"HTTP/1.1 302 Found\r\nLocation: /other\r\nConnection: close\r\nContent-Length: 0\r\n\r\n"
+)
+
+
+def test_no_metrics_by_default(requests):
+    assert requests.metrics is None
+
+
+def test_request_counted(pool, sock):
+    requests_session = adafruit_requests.Session(pool, metrics=True)
+
+    response = requests_session.get(URL)
+    content = response.content
+
+    sent = b"".join(call[0][0] for call in sock.send.call_args_list)
+    metrics = requests_session.metrics.snapshot()
+    assert metrics["responses_2xx"] == 1
+    assert metrics["bytes_sent"] == len(sent)
+    assert metrics["connections_new"] == 1
+    assert metrics["connections_reused"] == 0
+    assert metrics["retries"] == 0
+
+    response.close()
+
+    assert requests_session.metrics.snapshot()["bytes_received"] == len(content)
+
+
+def test_reuse_and_drain_counted(pool):
+    pool.socket.return_value = mocket.Mocket(mocket.MOCK_RESPONSE * 3)
+    requests_session = adafruit_requests.Session(pool, metrics=True)
+
+    requests_session.get(URL, stream=True).close()
+    assert requests_session.get(URL).text
+
+    metrics = requests_session.metrics.snapshot()
+    assert metrics["responses_2xx"] == 2
+    assert metrics["connections_new"] == 1
+    assert metrics["connections_reused"] == 1
+    assert metrics["drained"] == 1
+    assert metrics["drain_closes"] == 0
+
+
+def test_drained_content_received_once(pool, sock):
+    requests_session = adafruit_requests.Session(pool, metrics=True)
+
+    requests_session.get(URL, stream=True).close()
+
+    assert requests_session.metrics.snapshot()["bytes_received"] == len(mocket.MOCK_RESPONSE_TEXT)
+
+
+def test_drained_chunked_content_received_once(pool, sock):
+    sock._response = (
+        b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n"
+        b"4\r\nabcd\r\n6\r\nefghij\r\n0\r\n\r\n"
+    )
+    requests_session = adafruit_requests.Session(pool, metrics=True)
+
+    requests_session.get(URL, stream=True).close()
+
+    metrics = requests_session.metrics.snapshot()
+    assert metrics["drained"] == 1
+    assert metrics["bytes_received"] == 10
+
+
+def test_drain_close_counted(pool, sock):
+    pool.socket.side_effect = [sock, mocket.Mocket()]
+    requests_session = adafruit_requests.Session(pool, metrics=True, drain_limit=64)
+
+    requests_session.get(URL, stream=True).close()
+
+    metrics = requests_session.metrics.snapshot()
+    assert metrics["drained"] == 0
+    assert metrics["drain_closes"] == 1
+
+
+def test_retry_counted(pool):
+    pool.socket.side_effect = [mocket.Mocket(b""), mocket.Mocket()]
+    requests_session = adafruit_requests.Session(pool, metrics=True)
+
+    requests_session.get(URL).close()
+
+    metrics = requests_session.metrics.snapshot()
+    assert metrics["retries"] == 1
+    assert metrics["connections_new"] == 2
+    assert metrics["responses_2xx"] == 1
+
+
+def test_redirect_counted(pool):
+    pool.socket.side_effect = [mocket.Mocket(REDIRECT), mocket.Mocket()]
+    requests_session = adafruit_requests.Session(pool, metrics=True)
+
+    requests_session.get(URL).close()
+
+    metrics = requests_session.metrics.snapshot()
+    assert metrics["redirects"] == 1
+    assert metrics["responses_3xx"] == 1
+    assert metrics["responses_2xx"] == 1
+
+
+def test_reset(pool):
+    requests_session = adafruit_requests.Session(pool, metrics=True)
+    requests_session.get(URL).close()
+
+    requests_session.metrics.reset()
+
+    assert set(requests_session.metrics.snapshot().values()) == {0}
+
+
+def test_prometheus():
+    metrics = adafruit_requests.SessionMetrics()
+    metrics("headers_parsed", request=1, time=0, status_code=404)
+    metrics("connect_end", request=1, time=0, reused=True)
+    metrics("drain", request=1, time=0, bytes=None)
+
+    text = metrics.prometheus(prefix="device")
+
+    assert text.endswith("\n")
+    lines = text.splitlines()
+    assert "# TYPE device_responses_total counter" in lines
+    assert 'device_responses_total{class="4xx"} 1' in lines
+    assert 'device_responses_total{class="2xx"} 0' in lines
+    assert 'device_connections_total{reused="true"} 1' in lines
+    assert 'device_drains_total{result="closed"} 1' in lines
+    assert "device_retries_total 0" in lines
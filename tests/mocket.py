@@ -49,7 +49,8 @@ class Mocket:
         if self.fail_next_send:
             self.fail_next_send = False
             return 0
-        self.sent_data.append(data)
+        # Copy like a real socket would, senders are free to reuse their buffers.
+        self.sent_data.append(bytes(data))
         return len(data)
 
     def _readline(self):
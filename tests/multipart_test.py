@@ -0,0 +1,108 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: Unlicense
+
+"""Multipart Tests"""
+
+import gzip
+import io
+from unittest import mock
+
+import mocket
+import pytest
+
+import adafruit_requests
+
+URL = "http://" + mocket.MOCK_HOST_1 + "/post"
+DATA = bytes(range(256)) * 4
+EXPECTED = (
+    b"--boundary\r\n"
+    b'Content-Disposition: form-data; name="note"\r\n\r\n'
+    b"21\xc2\xb0C\r\n"
+    b"--boundary\r\n"
+    b'Content-Disposition: form-data; name="file"; filename="data.bin"\r\n'
+    b"Content-Type: application/octet-stream\r\n"
+    b"X-Part: 1\r\n\r\n" + DATA + b"\r\n"
+    b"--boundary--\r\n"
+)
+
+
+def _body(sock):
+    return b"".join(sock.sent_data).split(b"\r\n\r\n", 1)[1]
+
+
+def _fields(file_handle):
+    return {
+        "note": (None, "21°C"),
+        "file": ("data.bin", file_handle, "application/octet-stream", {"X-Part": "1"}),
+    }
+
+
+def test_encoder(pool, sock):
+    encoder = adafruit_requests.MultipartEncoder(_fields(io.BytesIO(DATA)), "boundary")
+    requests_session = adafruit_requests.Session(pool)
+
+    requests_session.post(URL, data=encoder)
+
+    assert _body(sock) == EXPECTED
+    assert len(encoder) == len(EXPECTED)
+    sent = b"".join(sock.sent_data)
+    assert b"Content-Type: multipart/form-data; boundary=boundary\r\n" in sent
+    assert b"Content-Length: %d\r\n" % len(EXPECTED) in sent
+
+
+def test_files_use_encoder(pool, sock):
+    requests_session = adafruit_requests.Session(pool)
+    requests_session._build_boundary_string = mock.Mock(return_value="boundary")
+
+    requests_session.post(URL, files=_fields(io.BytesIO(DATA)))
+
+    assert _body(sock) == EXPECTED
+
+
+def test_sized_with_stat(tmp_path):
+    path = tmp_path / "data.bin"
+    path.write_bytes(DATA)
+
+    with open(path, "rb") as file_handle, mock.patch.object(
+        adafruit_requests.Session, "_get_file_length", side_effect=AssertionError
+    ):
+        encoder = adafruit_requests.MultipartEncoder(_fields(file_handle), "boundary")
+        assert file_handle.tell() == 0
+
+    assert len(encoder) == len(EXPECTED)
+
+
+def test_wrapped_file_sized_by_content(pool, sock, tmp_path):
+    path = tmp_path / "data.bin.gz"
+    with gzip.open(path, "wb") as file_handle:
+        file_handle.write(DATA)
+    requests_session = adafruit_requests.Session(pool)
+
+    with gzip.open(path, "rb") as file_handle:
+        encoder = adafruit_requests.MultipartEncoder(_fields(file_handle), "boundary")
+        assert len(encoder) == len(EXPECTED)
+        requests_session.post(URL, data=encoder)
+
+    assert _body(sock) == EXPECTED
+
+
+def test_reused(pool, sock):
+    sock._response = mocket.MOCK_RESPONSE * 2
+    encoder = adafruit_requests.MultipartEncoder(_fields(io.BytesIO(DATA)), "boundary")
+    requests_session = adafruit_requests.Session(pool)
+
+    assert requests_session.post(URL, data=encoder).text
+    first = _body(sock)
+    sock.sent_data = []
+    requests_session.post(URL, data=encoder)
+
+    assert first == _body(sock) == EXPECTED
+
+
+def test_text_file(tmp_path):
+    path = tmp_path / "data.txt"
+    path.write_text("text")
+
+    with open(path) as file_handle, pytest.raises(ValueError):
+        adafruit_requests.MultipartEncoder({"file": ("data.txt", file_handle)})
@@ -0,0 +1,102 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: Unlicense
+
+"""Open Responses Tests"""
+
+import mocket
+import pytest
+
+import adafruit_requests
+
+TEXT = str(mocket.MOCK_RESPONSE_TEXT, "utf-8")
+
+
+def test_responses_stay_open(pool):
+    sock1 = mocket.Mocket()
+    sock2 = mocket.Mocket()
+    pool.socket.side_effect = [sock1, sock2]
+    requests_session = adafruit_requests.Session(pool, max_open_responses=2)
+
+    download = requests_session.get("http://" + mocket.MOCK_ENDPOINT_1, stream=True)
+    first = download.socket
+    poll = requests_session.get("http://" + mocket.MOCK_ENDPOINT_1)
+
+    assert pool.socket.call_count == 2
+    assert poll.text == TEXT
+    assert download.socket is first
+    assert download.text == TEXT
+
+
+def test_limit(pool):
+    pool.socket.side_effect = [mocket.Mocket(mocket.MOCK_RESPONSE * 2), mocket.Mocket()]
+    requests_session = adafruit_requests.Session(pool, max_open_responses=2)
+
+    first = requests_session.get("http://" + mocket.MOCK_ENDPOINT_1)
+    requests_session.get("http://" + mocket.MOCK_ENDPOINT_2)
+    with pytest.raises(RuntimeError):
+        requests_session.get("http://" + mocket.MOCK_ENDPOINT_1)
+
+    assert first.text == TEXT
+    assert requests_session.get("http://" + mocket.MOCK_ENDPOINT_1).text == TEXT
+    # The socket of the closed response was reused.
+    assert pool.socket.call_count == 2
+
+
+def test_per_host_limit(pool):
+    pool.socket.side_effect = [mocket.Mocket(), mocket.Mocket()]
+    requests_session = adafruit_requests.Session(
+        pool, max_open_responses=4, max_open_responses_per_host=1
+    )
+
+    requests_session.get("http://" + mocket.MOCK_ENDPOINT_1)
+    with pytest.raises(RuntimeError):
+        requests_session.get("http://" + mocket.MOCK_ENDPOINT_1)
+    assert requests_session.get("http://" + mocket.MOCK_ENDPOINT_2).text == TEXT
+
+
+def test_one_at_a_time_shares_socket(pool, sock):
+    sock._response = mocket.MOCK_RESPONSE * 2
+    requests_session = adafruit_requests.Session(pool, max_open_responses=2)
+
+    with requests_session.get("http://" + mocket.MOCK_ENDPOINT_1) as response:
+        assert response.text == TEXT
+    with requests_session.get("http://" + mocket.MOCK_ENDPOINT_1) as response:
+        assert response.text == TEXT
+
+    assert pool.socket.call_count == 1
+
+
+def test_failed_request_releases_lease(pool):
+    sock1 = mocket.Mocket(b"")
+    sock2 = mocket.Mocket(b"")
+    pool.socket.side_effect = [sock1, sock2, mocket.Mocket()]
+    requests_session = adafruit_requests.Session(pool, max_open_responses=2)
+
+    with pytest.raises(adafruit_requests.OutOfRetries):
+        requests_session.get("http://" + mocket.MOCK_ENDPOINT_1)
+
+    assert requests_session._lease_count == 0
+
+
+def test_invalid_limit(pool):
+    with pytest.raises(ValueError):
+        adafruit_requests.Session(pool, max_open_responses=0)
+
+
+def test_lease_held_until_socket_freed(pool, sock):
+    requests_session = adafruit_requests.Session(pool, max_open_responses=2)
+    response = requests_session.get("http://" + mocket.MOCK_ENDPOINT_1)
+    manager = requests_session._connection_manager
+    lease_counts = []
+    free_socket = manager.free_socket
+
+    def record_and_free(socket):
+        lease_counts.append(requests_session._lease_count)
+        free_socket(socket)
+
+    manager.free_socket = record_and_free
+    response.close()
+
+    assert lease_counts == [1]
+    assert requests_session._lease_count == 0
@@ -7,6 +7,7 @@
 import json
 
 import mocket
+import pytest
 
 import adafruit_requests
 
@@ -28,3 +29,43 @@ def test_json(pool):
     response = requests_session.get("http://" + mocket.MOCK_HOST_1 + "/get")
     sock.connect.assert_called_once_with((mocket.MOCK_POOL_IP, 80))
     assert response.json() == RESPONSE
+
+
+def test_receive_buffer_grows_geometrically(pool):
+    cookie = "a" * 4000
+    sock = mocket.Mocket(
+        b"HTTP/1.0 200 OK\r\nSet-Cookie: " + cookie.encode() + b"\r\nContent-Length: 0\r\n\r\n"
+    )
+    pool.socket.return_value = sock
+
+    requests_session = adafruit_requests.Session(pool, receive_buffer_size=64)
+    response = requests_session.get("http://" + mocket.MOCK_HOST_1 + "/get")
+    assert response.headers["set-cookie"] == cookie
+    assert len(response._receive_buffer) == 4096
+    # One receive per doubling rather than one per 32 bytes.
+    assert sock.recv_into.call_count < 10
+
+
+def test_receive_buffer_limit(pool):
+    sock = mocket.Mocket(b"HTTP/1.0 200 OK\r\nSet-Cookie: " + b"a" * 200 + b"\r\n\r\n")
+    pool.socket.return_value = sock
+
+    requests_session = adafruit_requests.Session(pool, max_receive_buffer_size=128)
+    with pytest.raises(RuntimeError) as context:
+        requests_session.get("http://" + mocket.MOCK_HOST_1 + "/get")
+    assert "max_receive_buffer_size (128 bytes)" in str(context)
+    sock.close.assert_called_once()
+
+
+def test_many_headers(pool):
+    headers = b"".join(b"X-Header-%d: value %d\r\n" % (i, i) for i in range(60))
+    sock = mocket.Mocket(b"HTTP/1.0 200 OK\r\n" + headers + b"Content-Length: 4\r\n\r\nbody")
+    pool.socket.return_value = sock
+
+    requests_session = adafruit_requests.Session(pool, receive_buffer_size=128)
+    response = requests_session.get("http://" + mocket.MOCK_HOST_1 + "/get")
+    for i in range(60):
+        assert response.headers[f"x-header-{i}"] == f"value {i}"
+    # The buffer only holds a few lines at a time so it never needs to grow.
+    assert len(response._receive_buffer) == 128
+    assert response.content == b"body"
@@ -0,0 +1,89 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: Unlicense
+
+"""Pipeline Tests"""
+
+import mocket
+import pytest
+
+import adafruit_requests
+
+URLS = [f"http://{mocket.MOCK_HOST_1}/{i}" for i in range(3)]
+
+
+def _response(body, *headers):
+    head = b"HTTP/1.1 200 OK\r\n" + b"".join(header + b"\r\n" for header in headers)
+    return head + b"Content-Length: %d\r\n\r\n" % len(body) + body
+
+
+CHUNKED = b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n3\r\none\r\n0\r\n\r\n"
+
+
+def test_pipeline(pool, sock):
+    sock._response = CHUNKED + _response(b"two") + _response(b"three")
+    requests_session = adafruit_requests.Session(pool, request_buffer_size=256)
+
+    responses = requests_session.pipeline(URLS)
+
+    assert [response.text for response in responses] == ["one", "two", "three"]
+    assert pool.socket.call_count == 1
+    assert [data.split(b"\r\n", 1)[0] for data in sock.sent_data] == [
+        b"GET /0 HTTP/1.1",
+        b"GET /1 HTTP/1.1",
+        b"GET /2 HTTP/1.1",
+    ]
+    sock.close.assert_not_called()
+
+
+def test_pipeline_head(pool, sock):
+    head = b"HTTP/1.1 200 OK\r\nContent-Length: 12345\r\nETag: abc\r\n\r\n"
+    sock._response = head * 2
+
+    responses = adafruit_requests.Session(pool).pipeline(URLS[:2], method="HEAD")
+
+    assert [response.status_code for response in responses] == [200, 200]
+    assert [response.headers["content-length"] for response in responses] == ["12345"] * 2
+    assert [response.headers["etag"] for response in responses] == ["abc"] * 2
+    assert [response.content for response in responses] == [b""] * 2
+
+
+def test_connection_close_falls_back(pool, sock):
+    sock._response = _response(b"one") + _response(b"two", b"Connection: close")
+    sock2 = mocket.Mocket(_response(b"three"))
+    pool.socket.side_effect = [sock, sock2]
+    requests_session = adafruit_requests.Session(pool)
+
+    responses = requests_session.pipeline(URLS)
+
+    assert [response.text for response in responses] == ["one", "two", "three"]
+    sock.close.assert_called_once()
+    assert len(sock2.sent_data) > 0
+
+
+def test_no_response_falls_back(pool):
+    sock = mocket.Mocket(b"")
+    sock2 = mocket.Mocket(_response(b"one"))
+    sock3 = mocket.Mocket(_response(b"two"))
+    pool.socket.side_effect = [sock, sock2, sock3]
+    requests_session = adafruit_requests.Session(pool)
+
+    responses = requests_session.pipeline(URLS[:2])
+
+    assert [response.text for response in responses] == ["one", "two"]
+    sock.close.assert_called_once()
+
+
+def test_only_idempotent(requests):
+    with pytest.raises(ValueError):
+        requests.pipeline(URLS, method="POST")
+
+
+def test_no_urls(requests, pool):
+    assert requests.pipeline([]) == []
+    pool.socket.assert_not_called()
+
+
+def test_same_host(requests):
+    with pytest.raises(ValueError):
+        requests.pipeline(["http://" + mocket.MOCK_ENDPOINT_1, "http://" + mocket.MOCK_ENDPOINT_2])
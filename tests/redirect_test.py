@@ -0,0 +1,171 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: Unlicense
+
+"""Redirect Tests"""
+
+import mocket
+import pytest
+
+import adafruit_requests
+
+URL = "http://" + mocket.MOCK_HOST_1
+
+
+class RedirectMocket(mocket.Mocket):
+    """Answers each request with a redirect from routes, or with the request line and body."""
+
+    def __init__(self, routes):
+        super().__init__(b"")
+        self.routes = routes
+        self.requests = []
+        self._request = b""
+
+    def _send(self, data):
+        sent = super()._send(data)
+        self._request += bytes(data)
+        head, _, body = self._request.partition(b"\r\n\r\n")
+        if not _:
+            return sent
+        length = 0
+        for line in head.split(b"\r\n")[1:]:
+            name, value = line.split(b": ", 1)
+            if name.lower() == b"content-length":
+                length = int(value)
+        if len(body) < length:
+            return sent
+        if b"Transfer-Encoding: chunked" in head and not body.endswith(b"0\r\n\r\n"):
+            return sent
+        self._request = b""
+        self.requests.append((head, body))
+        request_line = head.split(b"\r\n", 1)[0]
+        path = request_line.split(b" ")[1]
+        if path in self.routes:
+            status, location = self.routes[path]
+            response = b"HTTP/1.1 %d Redirect\r\nLocation: %s\r\nContent-Length: 0\r\n\r\n" % (
+                status,
+                location,
+            )
+        else:
+            content = b" ".join(request_line.split(b" ")[:2]) + b" " + body
+            response = b"HTTP/1.1 200 OK\r\nContent-Length: %d\r\n\r\n%s" % (
+                len(content),
+                content,
+            )
+        self._response = self._response[self._position :] + response
+        self._position = 0
+        return sent
+
+
+@pytest.fixture
+def server(pool):
+    server = RedirectMocket({})
+    pool.socket.return_value = server
+    return server
+
+
+@pytest.mark.parametrize(
+    ("status", "expected"),
+    (
+        (301, "GET /to "),
+        (302, "GET /to "),
+        (303, "GET /to "),
+        (307, "POST /to body"),
+        (308, "POST /to body"),
+    ),
+)
+def test_post_redirect_method(pool, server, status, expected):
+    server.routes[b"/from"] = (status, b"/to")
+    requests_session = adafruit_requests.Session(pool)
+
+    response = requests_session.post(URL + "/from", data="body", headers={"X-Test": "1"})
+
+    assert response.text == expected
+    head = server.requests[-1][0]
+    assert b"X-Test: 1\r\n" in head + b"\r\n"
+    if expected.startswith("GET"):
+        assert b"Content-Length" not in head
+        assert b"Content-Type" not in head
+
+
+def test_head_kept_for_303(pool, server):
+    server.routes[b"/from"] = (303, b"/to")
+    requests_session = adafruit_requests.Session(pool)
+
+    requests_session.head(URL + "/from")
+
+    assert server.requests[-1][0].startswith(b"HEAD /to HTTP/1.1\r\n")
+
+
+def test_too_many_redirects(pool, server):
+    server.routes[b"/a"] = (302, b"/b")
+    server.routes[b"/b"] = (302, b"/a")
+    requests_session = adafruit_requests.Session(pool, max_redirects=3)
+
+    with pytest.raises(adafruit_requests.TooManyRedirects):
+        requests_session.get(URL + "/a")
+
+    assert len(server.requests) == 4
+
+
+def test_long_chain_followed_without_recursion(pool, server):
+    for i in range(1500):
+        server.routes[b"/%d" % i] = (302, b"/%d" % (i + 1))
+    requests_session = adafruit_requests.Session(pool, max_redirects=1500)
+
+    assert requests_session.get(URL + "/0").text == "GET /1500 "
+
+
+def test_permanent_redirect_remembered(pool, server):
+    server.routes[b"/old"] = (301, b"/new")
+    requests_session = adafruit_requests.Session(pool)
+
+    assert requests_session.get(URL + "/old").text == "GET /new "
+    assert requests_session.get(URL + "/old").text == "GET /new "
+
+    assert [head.split(b"\r\n", 1)[0] for head, body in server.requests] == [
+        b"GET /old HTTP/1.1",
+        b"GET /new HTTP/1.1",
+        b"GET /new HTTP/1.1",
+    ]
+
+
+def test_temporary_redirect_not_remembered(pool, server):
+    server.routes[b"/old"] = (307, b"/new")
+    requests_session = adafruit_requests.Session(pool)
+
+    assert requests_session.get(URL + "/old").text
+    assert requests_session.get(URL + "/old").text
+
+    assert len(server.requests) == 4
+
+
+def test_remembered_redirects_least_recently_used_dropped(pool, server):
+    for path in (b"/a", b"/b", b"/c"):
+        server.routes[path] = (308, path + b"-new")
+    requests_session = adafruit_requests.Session(pool, redirect_cache_size=2)
+
+    for path in ("/a", "/b", "/a", "/c"):
+        assert requests_session.get(URL + path).text
+
+    assert list(requests_session._redirects) == [URL + "/a", URL + "/c"]
+
+
+def test_authorization_not_sent_to_other_host(pool, server):
+    server.routes[b"/from"] = (302, b"http://" + bytes(mocket.MOCK_HOST_2, "utf-8") + b"/to")
+    requests_session = adafruit_requests.Session(pool)
+
+    requests_session.get(URL + "/from", headers={"Authorization": "secret"})
+
+    assert b"Authorization" in server.requests[0][0]
+    assert b"Authorization" not in server.requests[1][0]
+
+
+def test_generator_body_not_resent(pool, server):
+    server.routes[b"/from"] = (307, b"/to")
+    requests_session = adafruit_requests.Session(pool)
+
+    response = requests_session.post(URL + "/from", data=(part for part in (b"a", b"b")))
+
+    assert response.status_code == 307
+    assert len(server.requests) == 1
@@ -0,0 +1,54 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: Unlicense
+
+"""Request Buffer Tests"""
+
+import mocket
+
+import adafruit_requests
+
+REQUEST_HEAD = (
+    b"GET /testwifi/index.html HTTP/1.1\r\n"
+    b"Host: wifitest.adafruit.com\r\n"
+    b"User-Agent: Adafruit CircuitPython\r\n"
+)
+
+
+def test_head_sent_once(pool, sock):
+    requests_session = adafruit_requests.Session(pool, request_buffer_size=256)
+    response = requests_session.get("http://" + mocket.MOCK_ENDPOINT_1)
+
+    assert sock.send.call_count == 1
+    assert sock.sent_data[0] == REQUEST_HEAD + b"\r\n"
+    assert response.text == str(mocket.MOCK_RESPONSE_TEXT, "utf-8")
+
+
+def test_small_body_sent_with_head(pool, sock):
+    requests_session = adafruit_requests.Session(pool, request_buffer_size=256)
+    requests_session.post("http://" + mocket.MOCK_HOST_1 + "/post", data="31F")
+
+    assert sock.send.call_count == 1
+    sent = sock.sent_data[0]
+    assert sent.startswith(b"POST /post HTTP/1.1\r\n")
+    assert sent.endswith(b"Content-Length: 3\r\n\r\n31F")
+
+
+def test_large_body_sent_separately(pool, sock):
+    data = b"x" * 300
+    requests_session = adafruit_requests.Session(pool, request_buffer_size=128)
+    requests_session.post("http://" + mocket.MOCK_HOST_1 + "/post", data=data)
+
+    assert sock.send.call_count == 2
+    assert sock.sent_data[1] == data
+    assert sock.sent_data[0].endswith(b"Content-Length: 300\r\n\r\n")
+
+
+def test_head_larger_than_buffer(pool, sock):
+    headers = {"X-Long": "y" * 40}
+    requests_session = adafruit_requests.Session(pool, request_buffer_size=32)
+    requests_session.get("http://" + mocket.MOCK_ENDPOINT_1, headers=headers)
+
+    assert sock.send.call_count > 1
+    sent = b"".join(sock.sent_data)
+    assert sent == REQUEST_HEAD + b"X-Long: " + b"y" * 40 + b"\r\n\r\n"
@@ -0,0 +1,148 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: Unlicense
+
+"""Retry Tests"""
+
+import mocket
+import pytest
+
+import adafruit_requests
+
+URL = "http://" + mocket.MOCK_ENDPOINT_1
+TEXT = str(mocket.MOCK_RESPONSE_TEXT, "utf-8")
+UNAVAILABLE = (
+    b"HTTP/1.1 503 Service Unavailable\r\nRetry-After: 7\r\nConnection: close\r\n"
+    b"Content-Length: 0\r\n\r\n"
+)
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(adafruit_requests.time, "sleep", sleeps.append)
+    return sleeps
+
+
+def test_default_retries_once(pool, sleeps):
+    pool.socket.side_effect = [mocket.Mocket(b""), mocket.Mocket(b""), mocket.Mocket()]
+    requests_session = adafruit_requests.Session(pool)
+
+    with pytest.raises(adafruit_requests.OutOfRetries):
+        requests_session.post(URL, data="body")
+
+    assert pool.socket.call_count == 2
+    assert sleeps == []
+
+
+def test_more_attempts_with_backoff(pool, sleeps):
+    pool.socket.side_effect = [mocket.Mocket(b""), mocket.Mocket(b""), mocket.Mocket()]
+    retry = adafruit_requests.Retry(total=3, backoff_factor=0.5)
+    requests_session = adafruit_requests.Session(pool, retry=retry)
+
+    assert requests_session.get(URL).text == TEXT
+
+    assert sleeps == [0.5, 1]
+
+
+def test_method_not_allowed_not_retried(pool, sleeps):
+    pool.socket.side_effect = [mocket.Mocket(b""), mocket.Mocket()]
+    retry = adafruit_requests.Retry(allowed_methods=adafruit_requests.Retry.IDEMPOTENT_METHODS)
+    requests_session = adafruit_requests.Session(pool, retry=retry)
+
+    with pytest.raises(adafruit_requests.OutOfRetries):
+        requests_session.post(URL, data="body")
+    pool.socket.assert_called_once()
+
+    assert requests_session.put(URL, data="body").text == TEXT
+
+
+def test_phase_not_allowed_not_retried(pool):
+    pool.socket.side_effect = [mocket.Mocket(b""), mocket.Mocket()]
+    retry = adafruit_requests.Retry(phases=("send",))
+    requests_session = adafruit_requests.Session(pool, retry=retry)
+
+    with pytest.raises(adafruit_requests.OutOfRetries):
+        requests_session.get(URL)
+
+    pool.socket.assert_called_once()
+
+
+def test_connect_retried(pool, sock):
+    broken = mocket.Mocket()
+    broken.connect.side_effect = OSError("refused")
+    pool.socket.side_effect = [broken, sock]
+    requests_session = adafruit_requests.Session(
+        pool, retry=adafruit_requests.Retry(phases=("connect",))
+    )
+
+    assert requests_session.get(URL).text == TEXT
+
+
+def test_connect_not_retried_by_default(pool, sock):
+    broken = mocket.Mocket()
+    broken.connect.side_effect = OSError("refused")
+    pool.socket.side_effect = [broken, sock]
+    requests_session = adafruit_requests.Session(pool)
+
+    with pytest.raises(OSError):
+        requests_session.get(URL)
+
+    assert pool.socket.call_count == 1
+
+
+def test_status_retried_after_retry_after(pool, sleeps):
+    pool.socket.side_effect = [mocket.Mocket(UNAVAILABLE), mocket.Mocket()]
+    retry = adafruit_requests.Retry(status_forcelist=(429, 503), backoff_factor=1)
+    requests_session = adafruit_requests.Session(pool, retry=retry)
+
+    response = requests_session.get(URL)
+
+    assert response.status_code == 200
+    assert sleeps == [7]
+
+
+def test_last_status_returned(pool, sleeps):
+    pool.socket.side_effect = [mocket.Mocket(UNAVAILABLE), mocket.Mocket(UNAVAILABLE)]
+    retry = adafruit_requests.Retry(status_forcelist=(503,))
+    requests_session = adafruit_requests.Session(pool, retry=retry)
+
+    response = requests_session.get(URL)
+
+    assert response.status_code == 503
+    assert sleeps == [7]
+
+
+def test_status_retry_keeps_lease(pool):
+    pool.socket.side_effect = [mocket.Mocket(UNAVAILABLE), mocket.Mocket()]
+    retry = adafruit_requests.Retry(status_forcelist=(503,), respect_retry_after=False)
+    requests_session = adafruit_requests.Session(pool, max_open_responses=2, retry=retry)
+
+    response = requests_session.get(URL)
+    assert response.status_code == 200
+    assert len(requests_session._leases[("http:", mocket.MOCK_HOST_1, 80)]) == 1
+
+    response.close()
+
+    assert not requests_session._leases.get(("http:", mocket.MOCK_HOST_1, 80))
+
+
+def test_delay():
+    retry = adafruit_requests.Retry(backoff_factor=0.5, backoff_max=3)
+
+    assert [retry.delay(retries) for retries in (1, 2, 3, 4)] == [0.5, 1, 2, 3]
+    assert retry.delay(1, "2") == 2
+    assert retry.delay(1, "600") == 3
+    assert retry.delay(1, "Wed, 21 Oct 2015 07:28:00 GMT") == 0.5
+
+
+def test_delay_jitter():
+    retry = adafruit_requests.Retry(backoff_factor=4, jitter=0.5)
+
+    for _ in range(20):
+        assert 2 <= retry.delay(1) <= 4
+
+
+def test_unknown_phase():
+    with pytest.raises(ValueError):
+        adafruit_requests.Retry(phases=("read",))
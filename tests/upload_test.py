@@ -0,0 +1,241 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: Unlicense
+
+"""Upload Tests"""
+
+import array
+import gzip
+import io
+import json
+import mmap
+import socket
+from unittest import mock
+
+import mocket
+import pytest
+
+import adafruit_requests
+
+URL = "http://" + mocket.MOCK_HOST_1 + "/post"
+DATA = bytes(range(256)) * 40
+
+
+def test_file_sent_in_chunks(pool, sock):
+    requests_session = adafruit_requests.Session(pool, upload_chunk_size=4096)
+
+    requests_session.post(URL, data=io.BytesIO(DATA))
+
+    body = sock.sent_data[-3:]
+    assert [len(chunk) for chunk in body] == [4096, 4096, len(DATA) - 8192]
+    assert b"".join(body) == DATA
+
+
+def test_buffer_reused(pool, sock):
+    sock._response = mocket.MOCK_RESPONSE * 2
+    requests_session = adafruit_requests.Session(pool, upload_chunk_size=1024)
+
+    assert requests_session._upload_buffer is None
+    assert requests_session.post(URL, data=io.BytesIO(DATA)).text
+    buffer = requests_session._upload_buffer
+    assert requests_session.post(URL, data=io.BytesIO(DATA)).text
+
+    assert len(buffer) == 1024
+    assert requests_session._upload_buffer is buffer
+
+
+def test_multipart_file_sent_in_chunks(pool, sock):
+    requests_session = adafruit_requests.Session(pool, upload_chunk_size=4096)
+
+    requests_session.post(URL, files={"file": ("data.bin", io.BytesIO(DATA))})
+
+    assert b"".join(sock.sent_data).count(DATA) == 1
+    assert [len(data) for data in sock.sent_data].count(4096) == 2
+
+
+def test_invalid_chunk_size(pool):
+    with pytest.raises(ValueError):
+        adafruit_requests.Session(pool, upload_chunk_size=0)
+
+
+def test_sendfile(pool, tmp_path):
+    path = tmp_path / "data.bin"
+    path.write_bytes(DATA)
+    sender, receiver = socket.socketpair()
+    requests_session = adafruit_requests.Session(pool)
+
+    with sender, receiver, open(path, "rb") as file_handle:
+        requests_session._send_file(sender, file_handle)
+        sender.shutdown(socket.SHUT_WR)
+        received = b""
+        while chunk := receiver.recv(65536):
+            received += chunk
+
+    assert received == DATA
+    assert requests_session._upload_buffer is None
+
+
+def test_no_sendfile_without_file_descriptor(pool, sock):
+    sock.sendfile = mock.Mock()
+    requests_session = adafruit_requests.Session(pool)
+
+    requests_session.post(URL, data=io.BytesIO(DATA))
+
+    sock.sendfile.assert_not_called()
+    assert b"".join(sock.sent_data).endswith(DATA)
+
+
+def test_no_sendfile_for_wrapped_file(pool, sock, tmp_path):
+    path = tmp_path / "data.bin.gz"
+    with gzip.open(path, "wb") as file_handle:
+        file_handle.write(DATA)
+    sock.sendfile = mock.Mock()
+    requests_session = adafruit_requests.Session(pool)
+
+    with gzip.open(path, "rb") as file_handle:
+        requests_session.post(URL, data=file_handle)
+
+    sent = b"".join(sock.sent_data)
+    sock.sendfile.assert_not_called()
+    assert b"Content-Length: %d\r\n" % len(DATA) in sent
+    assert sent.endswith(DATA)
+
+
+def test_no_sendfile_with_tls(pool, sock, tmp_path):
+    path = tmp_path / "data.bin"
+    path.write_bytes(DATA)
+    sock.sendfile = mock.Mock()
+    sock.cipher = mock.Mock()
+    requests_session = adafruit_requests.Session(pool)
+
+    with open(path, "rb") as file_handle:
+        requests_session.post(URL, data=file_handle)
+
+    sock.sendfile.assert_not_called()
+    assert b"".join(sock.sent_data).endswith(DATA)
+
+
+@pytest.mark.parametrize("body_type", (bytearray, memoryview))
+def test_buffer_body_not_copied(pool, sock, body_type):
+    body = body_type(bytearray(DATA))
+    requests_session = adafruit_requests.Session(pool)
+
+    requests_session.post(URL, data=body)
+
+    sent = sock.send.call_args_list[-1][0][0]
+    assert isinstance(sent, memoryview)
+    assert sent.obj is (body.obj if body_type is memoryview else body)
+    assert b"Content-Length: %d\r\n" % len(DATA) in b"".join(sock.sent_data)
+
+
+def test_mmap_body(pool, sock, tmp_path):
+    path = tmp_path / "data.bin"
+    path.write_bytes(DATA)
+    requests_session = adafruit_requests.Session(pool)
+
+    with open(path, "rb") as file_handle:
+        body = mmap.mmap(file_handle.fileno(), 0, access=mmap.ACCESS_READ)
+        requests_session.post(URL, data=body)
+
+    sent = b"".join(sock.sent_data)
+    assert b"Content-Length: %d\r\n" % len(DATA) in sent
+    assert sent.endswith(DATA)
+
+
+def test_memoryview_file_part(pool, sock):
+    requests_session = adafruit_requests.Session(pool)
+    requests_session._build_boundary_string = mock.Mock(return_value="boundary")
+
+    requests_session.post(URL, files={"file": ("data.bin", memoryview(DATA))})
+
+    sent = b"".join(sock.sent_data)
+    head, body = sent.split(b"\r\n\r\n", 1)
+    assert b"Content-Length: %d\r\n" % len(body) in head + b"\r\n"
+    assert DATA in body
+
+
+def _readings():
+    yield b"1,2\n"
+    yield "3,4\n"
+    yield b""
+    yield bytearray(b"5,6\n")
+
+
+def test_generator_body_chunked(pool, sock):
+    requests_session = adafruit_requests.Session(pool)
+
+    requests_session.post(URL, data=_readings())
+
+    head, body = b"".join(sock.sent_data).split(b"\r\n\r\n", 1)
+    assert b"Transfer-Encoding: chunked" in head
+    assert b"Content-Length" not in head
+    assert body == b"4\r\n1,2\n\r\n4\r\n3,4\n\r\n4\r\n5,6\n\r\n0\r\n\r\n"
+
+
+def test_each_chunk_sent_when_produced(pool, sock):
+    requests_session = adafruit_requests.Session(pool, request_buffer_size=256)
+    sends = []
+
+    def readings():
+        for reading in (b"1", b"2"):
+            sends.append(sock.send.call_count)
+            yield reading
+
+    requests_session.post(URL, data=readings())
+
+    # The head went out with the first chunk, which was sent before the second was made.
+    assert sends == [0, 1]
+
+
+def test_iterable_body_with_length(pool, sock):
+    requests_session = adafruit_requests.Session(pool)
+
+    requests_session.post(URL, data=[b"ab", b"cd"], headers={"Content-Length": "4"})
+
+    head, body = b"".join(sock.sent_data).split(b"\r\n\r\n", 1)
+    assert b"Transfer-Encoding" not in head
+    assert body == b"abcd"
+
+
+def test_generator_body_not_retried(pool):
+    sock1 = mocket.Mocket(b"")
+    pool.socket.side_effect = [sock1, mocket.Mocket()]
+    requests_session = adafruit_requests.Session(pool)
+
+    with pytest.raises(adafruit_requests.OutOfRetries):
+        requests_session.post(URL, data=_readings())
+
+    assert pool.socket.call_count == 1
+
+
+JSON = {
+    "device": "feather",
+    "readings": [{"t": i, "v": i / 4, "ok": i % 2 == 0, "note": None} for i in range(200)],
+    1: "non-string key",
+    "unicode": "°C",
+}
+
+
+def test_streamed_json(pool, sock):
+    requests_session = adafruit_requests.Session(pool, upload_chunk_size=256, stream_json=True)
+
+    requests_session.post(URL, json=JSON)
+
+    expected = bytes(json.dumps(JSON), "utf-8")
+    head, body = b"".join(sock.sent_data).split(b"\r\n\r\n", 1)
+    assert body == expected
+    assert b"Content-Length: %d\r\n" % len(expected) in head + b"\r\n"
+    assert b"Content-Type: application/json\r\n" in head + b"\r\n"
+    assert max(len(data) for data in sock.sent_data) <= 256
+
+
+@pytest.mark.parametrize("request_buffer_size", (0, 256))
+def test_array_body_length_in_bytes(pool, sock, request_buffer_size):
+    body = array.array("I", [1, 2, 3])
+    requests_session = adafruit_requests.Session(pool, request_buffer_size=request_buffer_size)
+
+    requests_session.post(URL, data=body)
+
+    head, sent = b"".join(sock.sent_data).split(b"\r\n\r\n", 1)
+    assert b"Content-Length: %d\r\n" % (body.itemsize * 3) in head + b"\r\n"
+    assert sent == body.tobytes()